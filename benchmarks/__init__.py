@@ -0,0 +1 @@
+"""추천 파이프라인 벤치마크 (python -m benchmarks.run)"""
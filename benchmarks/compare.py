@@ -0,0 +1,49 @@
+"""두 벤치마크 결과(JSON) 비교: python -m benchmarks.compare base.json new.json"""
+import json
+import sys
+
+
+def _metrics(run):
+    request = run["request"]
+    return {
+        "준비(ms)": run["build"]["total_ms"],
+        "추천 p50(ms)": request["end_to_end"].get("p50_ms"),
+        "추천 p95(ms)": request["end_to_end"].get("p95_ms"),
+        "일괄(ms/건)": run["batch"]["per_profile_ms"],
+        **{f"{name} p50(ms)": summary.get("p50_ms") for name, summary in request["stages"].items()},
+    }
+
+
+def compare(base, new):
+    """행 수가 같은 실행끼리 지표와 비율(new/base) 목록 반환"""
+    base_runs = {run["rows"]: run for run in base["runs"]}
+    rows = []
+    for run in new["runs"]:
+        if run["rows"] not in base_runs:
+            continue
+        before, after = _metrics(base_runs[run["rows"]]), _metrics(run)
+        for name, value in after.items():
+            old = before.get(name)
+            ratio = value / old if old and value is not None else None
+            rows.append((run["rows"], name, old, value, ratio))
+    return rows
+
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    if len(argv) != 2:
+        print(__doc__)
+        return 1
+    with open(argv[0], encoding="utf-8") as f:
+        base = json.load(f)
+    with open(argv[1], encoding="utf-8") as f:
+        new = json.load(f)
+    for rows, name, old, value, ratio in compare(base, new):
+        old_text = f"{old:,.3f}" if old is not None else "-"
+        ratio_text = f"x{ratio:.2f}" if ratio is not None else ""
+        print(f"{rows:>9,}  {name:<24} {old_text:>12} -> {value:>12,.3f}  {ratio_text}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,223 @@
+"""동시 사용자 부하 시험: 동시 사용자 수별 처리량, 지연 p50/p95/p99, 최대 RSS
+
+    python -m benchmarks.load                                  # 앱 제출 경로, 1~32명
+    python -m benchmarks.load --users 1 8 64 --requests 50 --rows 100000
+    python -m benchmarks.load --mode http                      # 같은 프로세스의 API 서버 경유
+    python -m benchmarks.load --mode http --url http://10.0.0.5:8000 --users 16 64
+    python -m benchmarks.load --no-cache --output load.json    # 결과 캐시 없이 매번 계산
+
+가상 사용자마다 스레드 하나가 입력 폼 선택지에서 뽑은 조건으로 --requests번 추천을 요청한다.
+app 모드는 Streamlit 세션 스크립트처럼 요청마다 load_dataset(파일 변경 확인)과 추천을
+실행하고, http 모드는 JSON API에 POST /recommend를 보낸다. 조건은 --pool개 조합 안에서
+뽑으므로 인기 조건이 반복되는 실제 사용 패턴처럼 결과 캐시가 적중할 수 있다.
+동시 사용자 수마다 결과 캐시를 비우고 시작하며, RSS는 측정 중 이 프로세스를 주기적으로
+샘플링한 최댓값이다(--url로 외부 서버를 시험하면 기록하지 않음).
+"""
+import argparse
+import json
+import os
+import resource
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.run import RESULTS_DIR, environment, summarize
+from benchmarks.synthetic import write_listings
+from proxity.cache import recommend_cached, result_cache
+from proxity.dataset import DATA_FILE, clear_cache, load_dataset
+from proxity.engine import Profile, recommend
+from proxity.scoring import AREA_GROUPS, CONDITIONS, HOUSEHOLD_LABELS, LINES
+from proxity.service import request_json, serve_in_thread
+
+DEFAULT_USERS = [1, 2, 4, 8, 16, 32]
+RSS_INTERVAL = 0.01
+ERROR_TEXT_LIMIT = 200
+
+
+def random_profile(rng):
+    """입력 폼 위젯 선택지(금액 0.5억 단위, 평형대, 컨디션, 노선 복수 선택, 단지 규모 라벨)에서 뽑은 조건"""
+    lines = [line for line in ["상관없음", *LINES] if rng.random() < 0.25]
+    if "상관없음" in lines:
+        lines = []
+    return Profile(
+        cash=float(rng.integers(0, 81)) / 2,
+        loan=float(rng.integers(0, 61)) / 2,
+        area_group=str(rng.choice(AREA_GROUPS)),
+        condition=str(rng.choice(CONDITIONS)),
+        lines=tuple(lines),
+        household=HOUSEHOLD_LABELS[str(rng.choice(list(HOUSEHOLD_LABELS)))],
+    )
+
+
+def _payload(profile):
+    return {"cash": profile.cash, "loan": profile.loan, "area_group": profile.area_group,
+            "condition": profile.condition, "lines": list(profile.lines), "household": profile.household}
+
+
+def _rss_bytes():
+    """현재 RSS (리눅스 /proc 기준, 없으면 프로세스 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RssSampler:
+    """측정 구간의 최대 RSS를 백그라운드 스레드에서 샘플링"""
+
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            self.peak = max(self.peak, _rss_bytes())
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+
+def app_session(path, cached=True):
+    """Streamlit 제출 한 번과 같은 경로: 데이터셋 확인 후 추천"""
+    def submit(profile):
+        dataset = load_dataset(path)
+        result = recommend_cached(profile, dataset) if cached else recommend(profile, dataset)
+        return len(result)
+    return submit
+
+
+def http_session(url):
+    """API 서버에 POST /recommend (2xx가 아니면 RuntimeError)"""
+    def submit(profile):
+        status, body = request_json(url.rstrip("/") + "/recommend", _payload(profile), timeout=60)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}: {body.get('error')}")
+        return len(body["results"])
+    return submit
+
+
+def run_level(submit, users, requests, pool, seed, think_ms=0.0, track_rss=True):
+    """동시 사용자 users명이 각각 requests번 추천을 요청하는 한 단계"""
+    result_cache.clear()
+    start_line = threading.Barrier(users)
+
+    def user(number):
+        rng = np.random.default_rng([seed, users, number])
+        latencies, errors = [], Counter()
+        start_line.wait()
+        for choice in rng.integers(0, len(pool), requests):
+            start = time.perf_counter()
+            try:
+                submit(pool[choice])
+            except Exception as e:
+                errors[f"{type(e).__name__}: {e}"[:ERROR_TEXT_LIMIT]] += 1
+            else:
+                latencies.append((time.perf_counter() - start) * 1000)
+            if think_ms:
+                time.sleep(rng.exponential(think_ms) / 1000)
+        return latencies, errors
+
+    with RssSampler() as rss, ThreadPoolExecutor(max_workers=users) as executor:
+        start = time.perf_counter()
+        outcomes = list(executor.map(user, range(users)))
+        wall = time.perf_counter() - start
+    latencies = [ms for samples, _ in outcomes for ms in samples]
+    errors = sum((errors for _, errors in outcomes), Counter())
+    return {
+        "users": users,
+        "requests": users * requests,
+        "errors": sum(errors.values()),
+        # 예외 종류와 메시지별 건수 (많은 순)
+        "error_types": dict(errors.most_common()),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall > 0 else None,
+        "latency": summarize(latencies),
+        "peak_rss_mb": round(rss.peak / 2 ** 20, 1) if track_rss else None,
+        "result_cache": result_cache.stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=DEFAULT_USERS, help="동시 사용자 수 목록")
+    parser.add_argument("--requests", type=int, default=20, help="사용자당 요청 수")
+    parser.add_argument("--pool", type=int, default=200, help="서로 다른 조건 조합 수")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="요청 사이 평균 대기 시간(지수 분포)")
+    parser.add_argument("--mode", choices=["app", "http"], default="app")
+    parser.add_argument("--url", help="http 모드에서 시험할 외부 서버 (기본: 이 프로세스에서 서버 실행)")
+    parser.add_argument("--no-cache", action="store_true", help="app 모드에서 결과 캐시 없이 매번 계산")
+    parser.add_argument("--data", default=DATA_FILE, help="매물 CSV 경로")
+    parser.add_argument("--rows", type=int, help="--data 대신 이 행 수의 합성 데이터 사용")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/load-<시각>.json)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    pool = [random_profile(rng) for _ in range(args.pool)]
+    report = {"environment": environment(),
+              "config": {key: value for key, value in vars(args).items() if key != "output"},
+              "levels": []}
+    server = None
+    with tempfile.TemporaryDirectory() as workdir:
+        path = args.data
+        if args.rows:
+            path = os.path.join(workdir, f"synthetic_{args.rows}.csv")
+            write_listings(path, args.rows, args.seed)
+        try:
+            if args.mode == "http" and args.url:
+                submit = http_session(args.url)
+            else:
+                clear_cache()
+                start = time.perf_counter()
+                if args.mode == "http":
+                    server = serve_in_thread(path=path)
+                    submit = http_session(f"http://127.0.0.1:{server.server_port}")
+                else:
+                    load_dataset(path)
+                    submit = app_session(path, cached=not args.no_cache)
+                report["build_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                print(f"{path}: 준비 {report['build_ms']:,.1f}ms, RSS {_rss_bytes() / 2 ** 20:,.1f}MB")
+
+            for users in args.users:
+                level = run_level(submit, users, args.requests, pool, args.seed, args.think_ms,
+                                  track_rss=not args.url)
+                report["levels"].append(level)
+                latency = level["latency"]
+                rss = f", 최대 RSS {level['peak_rss_mb']:,.1f}MB" if level["peak_rss_mb"] is not None else ""
+                print(f"동시 사용자 {users:>4}명: 처리량 {level['throughput_rps']:,.1f}건/s, "
+                      f"p50 {latency.get('p50_ms', 0):.2f}ms / p95 {latency.get('p95_ms', 0):.2f}ms / "
+                      f"p99 {latency.get('p99_ms', 0):.2f}ms{rss}, 오류 {level['errors']}")
+                for error, count in level["error_types"].items():
+                    print(f"    {count}건: {error}")
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
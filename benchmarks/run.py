@@ -0,0 +1,162 @@
+"""합성 데이터 크기별 파이프라인 단계/전체 추천 시간 측정
+
+    python -m benchmarks.run                      # 10^3 ~ 10^6행
+    python -m benchmarks.run --sizes 1000 10000 --output results.json
+    python -m benchmarks.compare base.json new.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import fixed_profiles, write_listings
+from proxity.dataset import clear_cache, load_dataset
+from proxity.engine import recommend, recommend_batch
+from proxity.profiling import trace_request
+from proxity.snapshot import build_snapshot, pa, snapshot_path
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def summarize(samples):
+    """밀리초 표본 요약 (평균, p50, p95, p99, 최소, 최대)"""
+    values = np.asarray(samples, dtype=float)
+    if len(values) == 0:
+        return {"count": 0}
+    return {
+        "count": int(len(values)),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "min_ms": round(float(values.min()), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def bench_build(csv_path):
+    """데이터셋 준비(로드, 전처리, 후보/색인 생성) 시간"""
+    clear_cache()
+    with trace_request("bench.build") as trace:
+        dataset = load_dataset(csv_path)
+    return dataset, {"total_ms": round(trace.total_ms, 3),
+                     "stages": {name: round(ms, 3) for name, ms in trace.stage_totals().items()}}
+
+
+def bench_snapshot(csv_path):
+    """스냅샷 빌드와 스냅샷 기준 콜드 로드 시간 (pyarrow 필요)"""
+    if pa is None:
+        return None
+    start = time.perf_counter()
+    build_snapshot(csv_path)
+    build_ms = (time.perf_counter() - start) * 1000
+    _, load = bench_build(csv_path)
+    os.remove(snapshot_path(csv_path))
+    clear_cache()
+    return {"build_ms": round(build_ms, 3), "load": load}
+
+
+def bench_requests(dataset, profiles, repeat):
+    """사용자 조건별 단건 추천의 단계/전체 시간"""
+    end_to_end, stages = [], {}
+    for _ in range(repeat):
+        for profile in profiles:
+            with trace_request("bench.recommend") as trace:
+                recommend(profile, dataset)
+            end_to_end.append(trace.total_ms)
+            for name, ms in trace.stage_totals().items():
+                stages.setdefault(name, []).append(ms)
+    return {"end_to_end": summarize(end_to_end),
+            "stages": {name: summarize(samples) for name, samples in stages.items()}}
+
+
+def bench_batch(dataset, profiles):
+    """recommend_batch 일괄 추천 시간"""
+    start = time.perf_counter()
+    recommend_batch(profiles, dataset)
+    total_ms = (time.perf_counter() - start) * 1000
+    return {"profiles": len(profiles), "total_ms": round(total_ms, 3),
+            "per_profile_ms": round(total_ms / max(len(profiles), 1), 3)}
+
+
+def run_size(rows, profiles, repeat, seed, workdir):
+    """한 데이터 크기에 대한 전체 측정"""
+    csv_path = os.path.join(workdir, f"synthetic_{rows}.csv")
+    start = time.perf_counter()
+    write_listings(csv_path, rows, seed)
+    generate_ms = (time.perf_counter() - start) * 1000
+
+    dataset, build = bench_build(csv_path)
+    result = {
+        "rows": rows,
+        "complexes": int(dataset.listings['단지명'].nunique()),
+        "candidates": len(dataset.candidates),
+        "generate_ms": round(generate_ms, 3),
+        "build": build,
+        "request": bench_requests(dataset, profiles, repeat),
+        "batch": bench_batch(dataset, profiles),
+        "snapshot": bench_snapshot(csv_path),
+    }
+    os.remove(csv_path)
+    return result
+
+
+def environment():
+    """실행 환경 (결과 비교 시 참고)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="합성 데이터 행 수")
+    parser.add_argument("--profiles", type=int, default=40, help="고정 사용자 조건 수")
+    parser.add_argument("--repeat", type=int, default=3, help="단건 추천 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/bench-<시각>.json)")
+    args = parser.parse_args(argv)
+
+    profiles = fixed_profiles(args.profiles, args.seed)
+    report = {"environment": environment(),
+              "config": {"sizes": args.sizes, "profiles": args.profiles, "repeat": args.repeat, "seed": args.seed},
+              "runs": []}
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.sizes:
+            run = run_size(rows, profiles, args.repeat, args.seed, workdir)
+            report["runs"].append(run)
+            e2e = run["request"]["end_to_end"]
+            print(f"{rows:>9,}행: 준비 {run['build']['total_ms']:,.1f}ms, "
+                  f"추천 p50 {e2e['p50_ms']:.2f}ms / p95 {e2e['p95_ms']:.2f}ms, "
+                  f"일괄 {run['batch']['per_profile_ms']:.2f}ms/건")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+"""jw_v0.*_streamlit_ready.csv와 같은 스키마의 합성 다지역 매물 데이터 생성"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from proxity.engine import Profile
+from proxity.scoring import AREA_GROUPS, CONDITIONS, HOUSEHOLDS, LINES
+
+COLUMNS = [
+    '법정동', '단지명', '주소', '세대수', '준공연도', '브랜드', '건축유형', '역세권', '노선',
+    '전용면적', '평형', '2025.03', '거래일', '2024.01~03', '2022.01~03', '2025.05_추정_실거래가',
+    '2025.05_보정_추정실거래가', '20250521호가', '기준단지_평단가', '보정_평단가', '유사단지',
+    '대지지분', '추정가', '추천 태그', '리포트 링크',
+]
+
+DISTRICTS = [
+    '잠원동', '반포동', '서초동', '방배동', '양재동', '우면동', '내곡동', '압구정동', '청담동', '삼성동',
+    '대치동', '도곡동', '개포동', '일원동', '수서동', '잠실동', '신천동', '문정동', '가락동', '이촌동',
+]
+BRANDS = ['나홀로', '90년대형', '브랜드', '80년대형']
+ROUTES = ['3, 신분당선', '3,7,9', '3', '3, 7', '7', '3, 7, 신분당선', '9', '2']
+AREAS = np.array([23.7, 28.9, 39.6, 49.9, 59.9, 66.3, 76.6, 84.5, 84.9, 99.8, 114.9, 134.7, 164.9, 198.2])
+TRADE_MONTHS = ['2025.03', '2025.02', '2025.01', '2024.12', '2024.11', '2024.1', '2024.09', '2024.07', '2024.06', '2023.05', '2018.09']
+
+# 실제 데이터에서 관찰된 비율
+MISSING_ASKING = 0.44    # 20250521호가 '-'
+MISSING_TRADE = 0.19     # 2025.03 / 거래일 '-'
+MISSING_FILL = 0.05      # 단지 단위로 채워야 하는 세대수/준공연도/건축유형 결측
+UNITS_PER_COMPLEX = 4.0  # 단지당 평균 매물 수
+
+
+def _price_text(values, missing, rng):
+    """숫자를 CSV와 같은 문자열로, 일부는 '-' 자리표시자로"""
+    text = np.char.mod('%.2f', np.round(values, 2)).astype(object)
+    text[rng.random(len(values)) < missing] = '-'
+    return text
+
+
+def generate_listings(rows, seed=0, districts=DISTRICTS):
+    """rows개 매물의 원본 CSV 형태 프레임 생성 (단지 단위 속성, 결측, 가격 분포 포함)"""
+    rng = np.random.default_rng(seed)
+    # 단지 크기: 1~13개 정도의 기하분포
+    sizes = rng.geometric(1 / UNITS_PER_COMPLEX, size=rows // int(UNITS_PER_COMPLEX) + 1)
+    sizes = sizes[np.cumsum(sizes) <= rows]
+    sizes = np.append(sizes, rows - sizes.sum())
+    sizes = sizes[sizes > 0]
+    n_complexes = len(sizes)
+    complex_of_row = np.repeat(np.arange(n_complexes), sizes)
+
+    district = rng.choice(districts, n_complexes)
+    households = np.clip(np.round(rng.lognormal(5.3, 1.1, n_complexes)), 5, 5000)
+    built = rng.integers(1975, 2026, n_complexes).astype(float)
+    building_type = np.where(built >= 2018, '신축', np.where(built < 1990, '재건축', rng.choice(['기축', '리모델링'], n_complexes)))
+    station = np.where(rng.random(n_complexes) < 0.72, 'Y', 'N')
+    route = rng.choice(ROUTES, n_complexes)
+    # 평당가(억/평): 지역·연식에 따라 0.2~1.2억
+    price_per_pyeong = np.clip(rng.lognormal(-0.8, 0.45, n_complexes) * (1 + (built - 1975) / 100), 0.15, 1.5)
+
+    area = rng.choice(AREAS, rows) + rng.normal(0, 0.3, rows).round(2)
+    pyeong = np.round(area * 0.355)
+    base_price = price_per_pyeong[complex_of_row] * pyeong * rng.normal(1.0, 0.05, rows)
+
+    def complex_attr(values, missing=MISSING_FILL):
+        column = pd.Series(values[complex_of_row], dtype=object if values.dtype.kind in 'OU' else float)
+        column[rng.random(rows) < missing] = np.nan
+        return column
+
+    df = pd.DataFrame({
+        '법정동': district[complex_of_row],
+        '단지명': np.char.add(np.char.add(district[complex_of_row].astype(str), ' 단지'),
+                            np.char.zfill(complex_of_row.astype(str), 6)),
+        '주소': np.char.add('합성로 ', np.arange(rows).astype(str)),
+        '세대수': complex_attr(households),
+        '준공연도': complex_attr(built),
+        '브랜드': rng.choice(BRANDS, rows),
+        '건축유형': complex_attr(building_type),
+        '역세권': complex_attr(station, missing=0.0),
+        '노선': route[complex_of_row],
+        '전용면적': area,
+        '평형': pyeong,
+        '2025.03': _price_text(base_price, MISSING_TRADE, rng),
+        '거래일': rng.choice(TRADE_MONTHS, rows).astype(object),
+        '2024.01~03': _price_text(base_price * 0.85, 0.7, rng),
+        '2022.01~03': _price_text(base_price * 0.95, 0.83, rng),
+        '2025.05_추정_실거래가': base_price * 1.02,
+        '2025.05_보정_추정실거래가': base_price * rng.normal(1.03, 0.02, rows),
+        '20250521호가': _price_text(base_price * rng.normal(1.06, 0.04, rows), MISSING_ASKING, rng),
+        '기준단지_평단가': np.where(rng.random(rows) < 0.4, price_per_pyeong[complex_of_row], 0.0),
+    })
+    df.loc[df['2025.03'] == '-', '거래일'] = '-'
+    for column in COLUMNS:
+        if column not in df:
+            df[column] = np.nan
+    return df[COLUMNS]
+
+
+def write_listings(path, rows, seed=0):
+    """합성 데이터를 CSV로 저장"""
+    generate_listings(rows, seed).to_csv(path, index=False)
+    return path
+
+
+def write_district_listings(directory, rows, seed=0, districts=DISTRICTS):
+    """합성 데이터를 법정동별 CSV(<법정동>_synthetic_streamlit_ready.csv)로 나눠 저장하고 경로 목록 반환"""
+    paths = []
+    for district, part in generate_listings(rows, seed, districts).groupby('법정동', sort=True):
+        path = os.path.join(directory, f"{district}_synthetic_streamlit_ready.csv")
+        part.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def fixed_profiles(count=40, seed=0):
+    """실제 입력 폼 선택지에서 뽑은 고정 사용자 조건 목록 (실행 간 비교용)"""
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for _ in range(count):
+        chosen = [line for line in LINES if rng.random() < 0.3]
+        profiles.append(Profile(
+            cash=float(rng.integers(0, 61)) / 2,
+            loan=float(rng.integers(0, 31)) / 2,
+            area_group=str(rng.choice(AREA_GROUPS)),
+            condition=str(rng.choice(CONDITIONS)),
+            lines=tuple(chosen),
+            household=str(rng.choice(HOUSEHOLDS)),
+        ))
+    return profiles
@@ -0,0 +1 @@
+"""잠원동생집사 추천 엔진 패키지"""
@@ -0,0 +1,91 @@
+"""추천 결과 메모이제이션: 정규화한 입력 조건과 데이터 버전을 키로 하는 LRU 캐시"""
+import os
+import threading
+from collections import OrderedDict
+
+from proxity.dataset import DATA_FILE, load_dataset
+from proxity.engine import recommend
+from proxity.profiling import stage
+
+DEFAULT_MAXSIZE = int(os.environ.get("PROXITY_RESULT_CACHE_SIZE", "4096"))
+
+
+class ResultCache:
+    """크기 제한 LRU 캐시 (스레드 안전)
+
+    키는 (데이터 경로, 데이터 버전, 정규화한 Profile)이다. 같은 경로의 데이터 버전이
+    바뀌면 이전 버전 항목을 모두 비운다. 저장된 결과 프레임은 공유되므로 읽기 전용으로 다룬다.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict_stale(self, path, version):
+        if self._versions.get(path) == version:
+            return
+        self._versions[path] = version
+        for key in [key for key in self._entries if key[0] == path and key[1] != version]:
+            del self._entries[key]
+
+    def get_or_compute(self, dataset, profile, compute):
+        """캐시된 결과를 돌려주거나 compute(profile)로 계산해 저장"""
+        key = (dataset.path, dataset.version, profile)
+        with self._lock:
+            self._evict_stale(dataset.path, dataset.version)
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = compute(profile)
+        with self._lock:
+            if self._versions.get(dataset.path) == dataset.version:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        """적중/미적중 횟수와 적중률"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# 프로세스 내 모든 세션이 공유하는 기본 캐시
+result_cache = ResultCache()
+
+
+def recommend_cached(profile, dataset=None, cache=None):
+    """정규화한 조건으로 recommend 결과를 캐시에서 조회 (없으면 계산 후 저장)"""
+    if dataset is None:
+        dataset = load_dataset(DATA_FILE)
+    if cache is None:
+        cache = result_cache
+    with stage("result_cache") as timing:
+        result = cache.get_or_compute(dataset, profile.normalized(), lambda p: recommend(p, dataset))
+        timing.rows_out = len(result)
+    return result
@@ -0,0 +1,322 @@
+"""매물 데이터 로드 및 전처리 (프로세스 단위 캐시)"""
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from proxity.index import PriceIndex
+from proxity.prices import (TREND_COLUMNS, apply_observations, delta_files, history_columns, load_price_delta,
+                            match_delta, price_history, trend_features)
+from proxity.pricing import fill_asking_prices
+from proxity.scoring import ScoreComponents
+from proxity.similar import SimilarityIndex
+from proxity.profiling import stage
+from proxity.snapshot import read_snapshot, read_snapshot_columns, read_snapshot_header, snapshot_path
+
+logger = logging.getLogger(__name__)
+
+DATA_FILE = "data/jw_v0.13_streamlit_ready.csv"
+
+# 단지 단위로 채워 넣는 속성 열
+COMPLEX_FILL_COLUMNS = ['단지명', '준공연도', '세대수', '건축유형', '역세권', '노선']
+BUILDING_FILL_COLUMNS = ['건축유형', '역세권', '노선']
+# '-' 자리표시자가 섞여 문자열로 읽히는 가격 시점 열
+PRICE_COLUMNS = ['2025.03', '2024.01~03', '2022.01~03', '20250521호가']
+# 반복되는 문자열 열 (카테고리형으로 보관)
+CATEGORY_COLUMNS = ['법정동', '단지명', '주소', '브랜드', '건축유형', '역세권', '노선', '추천 태그']
+# 추천에 쓰지 않는 리포트용 열 (필요할 때만 load_report_columns로 읽음)
+REPORT_COLUMNS = ['리포트 링크', '유사단지', '대지지분']
+
+
+@dataclass(frozen=True)
+class PreparedDataset:
+    """전처리가 끝난 매물 데이터 (읽기 전용으로 공유)"""
+    path: str
+    version: str
+    listings: pd.DataFrame
+    candidates: pd.DataFrame
+    price_index: PriceIndex
+    prices: pd.DataFrame  # 날짜별 가격 관측 (proxity.prices.price_history)
+    score_components: ScoreComponents  # 후보별 조건 선택지 점수 성분
+    similar: SimilarityIndex  # 유사 단지 최근접 이웃 색인
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    signature: tuple
+    base_version: str
+    deltas: tuple
+    dataset: PreparedDataset
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def file_signature(path):
+    """파일 변경 감지용 (mtime, 크기)"""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def file_digest(path):
+    """파일 내용 해시 (데이터 버전)"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fill_by_complex(df, columns):
+    """단지명 기준 ffill 후 전체 bfill (기존 앱과 동일한 채우기 순서)"""
+    return df.groupby('단지명')[columns].ffill().bfill()
+
+
+def prepare_listings(df):
+    """원본 CSV 프레임을 추천에 쓰는 형태로 정리"""
+    df = df.copy()
+    # 단지명 기준으로 세대수, 준공연도, 건축유형, 역세권, 노선 채우기
+    with stage("group_fill", rows_in=len(df)):
+        df[COMPLEX_FILL_COLUMNS] = fill_by_complex(df, COMPLEX_FILL_COLUMNS)
+    with stage("coerce", rows_in=len(df)):
+        placeholders = {}
+        for column in PRICE_COLUMNS:
+            values = pd.to_numeric(df[column], errors='coerce')
+            placeholders[column] = int((df[column].notna() & values.isna()).sum())
+            df[column] = values
+        logger.info("가격 열 자리표시자('-' 등) -> 결측: %s", placeholders)
+        df['실거래가'] = df['2025.03']
+        df['현재호가'] = df['20250521호가']
+        df['추정가'] = pd.to_numeric(df['2025.05_보정_추정실거래가'], errors='coerce')
+        df['거래일'] = pd.to_datetime(df['거래일'], errors='coerce')
+        df['거래연도'] = df['거래일'].dt.year
+    # 이미 '신축'인 경우를 보호하고, 2018년 이후 준공은 신축으로 분류
+    with stage("building_type", rows_in=len(df)):
+        is_new = (df['건축유형'] != '신축') & (df['준공연도'] >= 2018)
+        df['건축유형'] = df['건축유형'].mask(is_new, '신축')
+        df[BUILDING_FILL_COLUMNS] = fill_by_complex(df, BUILDING_FILL_COLUMNS)
+    return df
+
+
+def _downcast_float(values):
+    """값 손실이 없을 때만 float32로 변환 (세대수, 준공연도 등 정수값 열)"""
+    downcast = values.astype(np.float32)
+    if np.array_equal(downcast.to_numpy(dtype=np.float64), values.to_numpy(dtype=np.float64), equal_nan=True):
+        return downcast
+    return values
+
+
+def compact_listings(df):
+    """반복 문자열은 카테고리형, 정수값 실수 열은 float32로 줄인 프레임
+
+    비교 연산은 그대로 동작하지만 산술 연산은 float64로 변환해서 해야 결과가 같다.
+    """
+    df = df.copy()
+    for column in CATEGORY_COLUMNS:
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    for column in df.select_dtypes(include=['float64']).columns:
+        df[column] = _downcast_float(df[column])
+    return df
+
+
+def memory_usage(df):
+    """프레임의 실제 메모리 사용량 (바이트)"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def eligible_listings(listings):
+    """추천 대상 매물: 실거래가 1억 이상"""
+    return listings[listings['실거래가'] >= 1.0]
+
+
+def score_bounds(eligible):
+    """통합_점수 정규화 범위 (세대수 최소/최대, 준공연도 최소/최대): 추천 대상 전체 기준"""
+    세대수, 준공연도 = eligible['세대수'].astype(float), eligible['준공연도'].astype(float)
+    return (세대수.min(), 세대수.max(), 준공연도.min(), 준공연도.max())
+
+
+def add_complex_scores(df, bounds):
+    """세대수/준공연도 정규화 점수와 통합_점수 열 추가 (제자리 변경)"""
+    min_households, max_households, min_year, max_year = bounds
+    세대수, 준공연도 = df['세대수'].astype(float), df['준공연도'].astype(float)
+    df['세대수_점수'] = (세대수 - min_households) / (max_households - min_households) if max_households != min_households else 0
+    df['준공연도_점수'] = (준공연도 - min_year) / (max_year - min_year) if max_year != min_year else 0
+    df['통합_점수'] = 0.6 * df['세대수_점수'] + 0.4 * df['준공연도_점수']
+
+
+def price_candidates(df):
+    """역세권/노선 우선 플래그, 동일 단지 호가 추정, 추천가격 계산 후 가격 없는/오래된 매물 제외
+
+    호가 추정은 같은 단지 안에서만 이뤄지므로 단지 단위 부분 집합에도 그대로 쓸 수 있다.
+    """
+    df['역세권_우선'] = df['역세권'].astype(object).map({'Y': 1, 'N': 0})
+    df['노선_우선'] = df['노선'].astype(str).str.contains('[379]', na=False).astype(int)
+
+    # 동일 단지 유사 평형 호가 추정
+    with stage("asking_price", rows_in=len(df)):
+        df[['현재호가', '가격출처', '호가전용면적']] = fill_asking_prices(df)
+
+    # 추천가격: 호가(추정 포함) 우선, 없으면 보정 추정 실거래가
+    df['추천가격'] = df['현재호가']
+    df.loc[df['추천가격'].isna(), '추천가격'] = df['추정가']
+    df['가격출처_실사용'] = df['가격출처'].fillna('실거래가')
+    df[['가격출처', '가격출처_실사용']] = df[['가격출처', '가격출처_실사용']].astype('category')
+
+    # 추천가격이 0이거나 NaN인 경우, 오래된 거래 제외
+    df = df[df['추천가격'].notna() & (df['추천가격'] > 0)]
+    df = df[(df['거래연도'].isna()) | (df['거래연도'] >= 2024)]
+    return df
+
+
+def prepare_candidates(listings):
+    """추천 후보 매물: 사용자 입력과 무관한 보조 점수, 호가 추정, 추천가격까지 계산"""
+    # 필터링: 가격 1억 이상
+    df = eligible_listings(listings).copy()
+    add_complex_scores(df, score_bounds(df))
+    return price_candidates(df)
+
+
+def concat_rows(frames):
+    """행 색인 순서로 이어 붙이기 (카테고리형 열은 범주를 합쳐 카테고리형 유지)"""
+    merged = pd.concat(frames).sort_index(kind="stable")
+    for column in frames[0]:
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            categories = frames[0][column].cat.categories
+            for frame in frames[1:]:
+                categories = categories.union(frame[column].astype('category').cat.categories, sort=False)
+            merged[column] = pd.Categorical(merged[column].astype(object), categories=categories)
+    return merged
+
+
+def update_candidates(candidates, listings, complexes):
+    """가격이 바뀐 단지만 호가 추정/추천가격을 다시 계산해 후보 프레임 갱신
+
+    통합_점수 정규화 범위는 추천 대상 전체에서 다시 구해 나머지 단지에도 적용한다(열 연산만).
+    """
+    eligible = eligible_listings(listings)
+    bounds = score_bounds(eligible)
+    changed = eligible[eligible['단지명'].isin(complexes)].copy()
+    add_complex_scores(changed, bounds)
+    kept = candidates[~candidates['단지명'].isin(complexes)].copy()
+    add_complex_scores(kept, bounds)
+    return concat_rows([kept, price_candidates(changed)])
+
+
+def _signature(path):
+    return file_signature(path) if os.path.exists(path) else None
+
+
+def _resolve_source(path):
+    """읽을 파일과 데이터 버전: 원본과 내용이 같은 스냅샷이 있으면 스냅샷, 없으면 CSV"""
+    header = read_snapshot_header(snapshot_path(path))
+    if header is not None and (not os.path.exists(path) or file_digest(path) == header["version"]):
+        return snapshot_path(path), header["version"]
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return path, file_digest(path)
+
+
+def _prepared(key, version, listings, candidates, prices):
+    with stage("index", rows_in=len(candidates)):
+        price_index = PriceIndex(candidates)
+        return PreparedDataset(key, version, listings, candidates, price_index, prices,
+                               ScoreComponents(candidates), SimilarityIndex(candidates, price_index.complex_codes))
+
+
+def _build_dataset(key, path, source, version):
+    if source == path:
+        with stage("load_csv") as timing:
+            raw = pd.read_csv(path, usecols=lambda column: column not in REPORT_COLUMNS)
+            timing.rows_out = len(raw)
+        listings = prepare_listings(raw)
+    else:
+        with stage("load_snapshot") as timing:
+            listings = read_snapshot(source, exclude=REPORT_COLUMNS)
+            timing.rows_out = len(listings)
+    # 시점별 가격 열은 날짜별 관측 저장소로 옮기고 매물 프레임에서는 제외
+    with stage("price_history", rows_in=len(listings)) as timing:
+        prices = price_history(listings)
+        listings = listings.drop(columns=history_columns(listings))
+        listings[TREND_COLUMNS] = trend_features(listings, prices)
+        timing.rows_out = len(prices)
+    before = memory_usage(listings)
+    with stage("compact", rows_in=len(listings)):
+        listings = compact_listings(listings)
+    logger.info("매물 데이터 메모리: %.1fKB -> %.1fKB (%s)", before / 1024, memory_usage(listings) / 1024, source)
+    with stage("candidates", rows_in=len(listings)) as timing:
+        candidates = prepare_candidates(listings)
+        timing.rows_out = len(candidates)
+    return _prepared(key, version, listings, candidates, prices)
+
+
+def _apply_deltas(dataset, deltas):
+    """가격 델타 파일을 차례로 반영하고 가격이 바뀐 단지의 후보만 다시 계산한 데이터셋"""
+    listings, prices, version = dataset.listings, dataset.prices, dataset.version
+    complexes = set()
+    with stage("price_delta", rows_in=len(deltas)) as timing:
+        for delta_path, *_ in deltas:
+            try:
+                observations, unmatched = match_delta(listings, load_price_delta(delta_path))
+            except (OSError, ValueError) as e:
+                logger.error("가격 델타 반영 실패, 건너뜀: %s", e)
+                continue
+            if unmatched:
+                logger.warning("%s: 매물과 맞지 않는 델타 %d행 제외", delta_path, unmatched)
+            listings, prices, touched = apply_observations(listings, prices, observations)
+            complexes |= touched
+            version = hashlib.sha1(f"{version}:{file_digest(delta_path)}".encode()).hexdigest()
+        listings = listings.assign(**trend_features(listings, prices))
+        candidates = update_candidates(dataset.candidates, listings, complexes)
+        timing.rows_out = len(complexes)
+    logger.info("가격 델타 %d개 반영: 단지 %d곳 재계산", len(deltas), len(complexes))
+    return _prepared(dataset.path, version, listings, candidates, prices)
+
+
+def load_dataset(path=DATA_FILE):
+    """전처리된 데이터셋 반환: 프로세스 내 모든 세션이 공유
+
+    원본 파일 mtime/해시가 바뀌면 다시 만들고, 델타 폴더에 새 가격 델타 파일만 추가되었으면
+    기존 데이터셋에 그 델타만 반영한다.
+    """
+    key = os.path.abspath(path)
+    signature = (_signature(path), _signature(snapshot_path(path)))
+    deltas = delta_files(path)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None or entry.signature != signature:
+            source, version = _resolve_source(path)
+            if entry is not None and entry.base_version == version:
+                # 내용은 그대로이고 mtime만 바뀐 경우
+                entry = _CacheEntry(signature, version, entry.deltas, entry.dataset)
+            else:
+                entry = _CacheEntry(signature, version, (), _build_dataset(key, path, source, version))
+        if entry.deltas != deltas:
+            applied = len(entry.deltas)
+            if deltas[:applied] != entry.deltas:
+                # 이미 반영한 델타가 바뀌거나 지워졌으면 원본부터 다시
+                source, version = _resolve_source(path)
+                entry = _CacheEntry(signature, version, (), _build_dataset(key, path, source, version))
+                applied = 0
+            entry = _CacheEntry(signature, entry.base_version, deltas, _apply_deltas(entry.dataset, deltas[applied:]))
+        _cache[key] = entry
+        return entry.dataset
+
+
+def load_report_columns(path=DATA_FILE):
+    """리포트용 열(리포트 링크, 유사단지, 대지지분)을 매물과 같은 인덱스로 읽기"""
+    snapshot = snapshot_path(path)
+    if read_snapshot_header(snapshot) is not None:
+        return read_snapshot_columns(snapshot, REPORT_COLUMNS)
+    return pd.read_csv(path, usecols=lambda column: column in REPORT_COLUMNS)
+
+
+def clear_cache():
+    """캐시된 데이터셋 모두 제거"""
+    with _cache_lock:
+        _cache.clear()
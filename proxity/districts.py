@@ -0,0 +1,185 @@
+"""법정동별 매물 CSV를 프로세스 풀에서 병렬 전처리하고 법정동 단위로 지연 로드
+
+    python -m proxity.districts                   # data/*_streamlit_ready.csv 전체
+    python -m proxity.districts --workers 8 data/banpo_v0.1_streamlit_ready.csv ...
+
+각 CSV(파티션)는 워커 프로세스에서 전처리되어 옆에 .arrow 스냅샷으로 저장되고,
+파티션별 법정동 목록과 버전은 data/districts.json 매니페스트에 기록된다. 조회할 때는
+선택한 법정동이 들어 있는 파티션만 load_dataset으로 읽고, 여러 파티션이면 합친 데이터셋을
+만들어 캐시한다. 원본 CSV와 내용이 같은 스냅샷이 이미 있으면 다시 만들지 않는다.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from proxity.dataset import (PreparedDataset, add_complex_scores, compact_listings, concat_rows, eligible_listings,
+                             file_digest, load_dataset, prepare_listings, score_bounds)
+from proxity.index import PriceIndex
+from proxity.scoring import ScoreComponents
+from proxity.similar import SimilarityIndex
+from proxity.snapshot import pa, read_snapshot_columns, read_snapshot_header, snapshot_path, write_snapshot
+
+DISTRICT_GLOB = "data/*_streamlit_ready.csv"
+MANIFEST_FILE = "data/districts.json"
+MANIFEST_SCHEMA_VERSION = "1"
+# 여러 파티션을 합친 데이터셋은 최근 조합 몇 개만 유지
+MERGED_CACHE_SIZE = 8
+# 동이 다르면 단지명이 같아도 다른 단지로 취급
+COMPLEX_COLUMNS = ('법정동', '단지명')
+
+_merged = OrderedDict()
+_merged_lock = threading.Lock()
+
+
+def discover(pattern=DISTRICT_GLOB):
+    """법정동별 매물 CSV 경로 목록"""
+    return sorted(glob.glob(pattern))
+
+
+def build_partition(csv_path, force=False):
+    """CSV 하나를 전처리해 스냅샷으로 저장하고 매니페스트 항목 반환 (워커 프로세스에서 실행)"""
+    start = time.perf_counter()
+    path = snapshot_path(csv_path)
+    version = file_digest(csv_path)
+    header = read_snapshot_header(path)
+    rebuilt = force or header is None or header["version"] != version
+    if rebuilt:
+        listings = compact_listings(prepare_listings(pd.read_csv(csv_path)))
+        write_snapshot(listings, path, csv_path, version)
+        districts = listings['법정동']
+    else:
+        districts = read_snapshot_columns(path, ['법정동'])['법정동']
+    return {
+        "path": csv_path,
+        "snapshot": path,
+        "version": version,
+        "districts": sorted(str(name) for name in districts.dropna().unique()),
+        "rows": len(districts),
+        "rebuilt": rebuilt,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def build_partitions(paths=None, workers=None, manifest_path=MANIFEST_FILE, force=False):
+    """파티션들을 프로세스 풀에서 병렬로 만들고 매니페스트 기록 (workers=1이면 현재 프로세스에서 차례로)"""
+    if pa is None:
+        raise RuntimeError("파티션 스냅샷을 만들려면 pyarrow가 필요합니다.")
+    paths = list(paths or discover())
+    if workers == 1 or len(paths) <= 1:
+        partitions = [build_partition(path, force) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partitions = list(pool.map(build_partition, paths, [force] * len(paths)))
+    manifest = {
+        "schema_version": MANIFEST_SCHEMA_VERSION,
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "partitions": partitions,
+    }
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def read_manifest(path=MANIFEST_FILE):
+    """매니페스트 읽기 (없거나 스키마 버전이 다르면 None)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    return manifest if manifest.get("schema_version") == MANIFEST_SCHEMA_VERSION else None
+
+
+def district_names(manifest):
+    """매니페스트에 있는 모든 법정동 (가나다순)"""
+    return sorted({name for partition in manifest["partitions"] for name in partition["districts"]})
+
+
+def _offset(frame, offset):
+    return frame.set_axis(frame.index + offset)
+
+
+def merge_datasets(datasets, districts):
+    """여러 파티션 데이터셋에서 선택한 법정동 행만 모아 하나의 데이터셋으로 합치기
+
+    호가 추정과 추천가격은 단지 안에서만 계산되므로 파티션 결과를 그대로 쓰고,
+    통합_점수 정규화 범위만 합친 추천 대상 전체 기준으로 다시 계산한다.
+    행 색인은 파티션마다 겹치지 않도록 밀어서 붙인다.
+    """
+    listings, candidates, prices = [], [], []
+    offset = 0
+    for dataset in datasets:
+        keep = dataset.listings['법정동'].isin(districts)
+        listings.append(_offset(dataset.listings[keep], offset))
+        candidates.append(_offset(dataset.candidates[dataset.candidates['법정동'].isin(districts)], offset))
+        observed = dataset.prices[dataset.prices['행'].isin(dataset.listings.index[keep])]
+        prices.append(observed.assign(행=observed['행'] + offset))
+        offset += int(dataset.listings.index.max()) + 1 if len(dataset.listings) else 0
+    listings = concat_rows(listings)
+    candidates = concat_rows(candidates)
+    add_complex_scores(candidates, score_bounds(eligible_listings(listings)))
+    key = ",".join(districts)
+    version = hashlib.sha1("|".join([key, *(dataset.version for dataset in datasets)]).encode()).hexdigest()
+    price_index = PriceIndex(candidates, COMPLEX_COLUMNS)
+    return PreparedDataset(f"districts:{key}", version, listings, candidates, price_index,
+                           pd.concat(prices, ignore_index=True), ScoreComponents(candidates),
+                           SimilarityIndex(candidates, price_index.complex_codes))
+
+
+def load_districts(districts, manifest=None):
+    """선택한 법정동의 데이터셋: 해당 파티션만 읽고, 한 파티션이 그대로 맞으면 그 데이터셋을 공유"""
+    manifest = manifest or read_manifest()
+    if manifest is None:
+        raise FileNotFoundError(MANIFEST_FILE)
+    districts = tuple(sorted(set(districts)))
+    partitions = [partition for partition in manifest["partitions"] if set(partition["districts"]) & set(districts)]
+    if not partitions:
+        raise ValueError(f"데이터가 없는 법정동입니다: {', '.join(districts)}")
+    datasets = [load_dataset(partition["path"]) for partition in partitions]
+    if len(partitions) == 1 and set(partitions[0]["districts"]) <= set(districts):
+        return datasets[0]
+    key = (districts, tuple((dataset.path, dataset.version) for dataset in datasets))
+    with _merged_lock:
+        merged = _merged.get(key)
+        if merged is None:
+            merged = _merged[key] = merge_datasets(datasets, districts)
+            while len(_merged) > MERGED_CACHE_SIZE:
+                _merged.popitem(last=False)
+        _merged.move_to_end(key)
+        return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help=f"매물 CSV (기본: {DISTRICT_GLOB})")
+    parser.add_argument("--workers", type=int, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--manifest", default=MANIFEST_FILE)
+    parser.add_argument("--force", action="store_true", help="스냅샷이 최신이어도 다시 만들기")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or discover()
+    if not paths:
+        print(f"'{DISTRICT_GLOB}'에 해당하는 파일이 없습니다.")
+        return 1
+    start = time.perf_counter()
+    manifest = build_partitions(paths, args.workers, args.manifest, args.force)
+    for partition in manifest["partitions"]:
+        state = "빌드" if partition["rebuilt"] else "최신"
+        print(f"{partition['path']}: {partition['rows']:,}행, 법정동 {len(partition['districts'])}개 "
+              f"({state}, {partition['seconds']:.2f}s)")
+    print(f"파티션 {len(paths)}개, {time.perf_counter() - start:.2f}s -> {args.manifest}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,282 @@
+"""추천 엔진: 사용자 조건(Profile)을 받아 상위 3개 단지를 선정"""
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from proxity.dataset import DATA_FILE, load_dataset
+from proxity.profiling import stage
+from proxity.ranking import RankingKeys, rank_candidates
+from proxity.scoring import HOUSEHOLD_LABELS, LINES, get_area_range
+
+TOP_N = 3
+# 추천 단지마다 함께 보여주는 예산 내 유사 단지 수
+SIMILAR_N = 3
+# 예산 구간 탐색 최대 지점 수
+SWEEP_MAX_POINTS = 400
+
+# 순위 계산에 필요한 열만 추려서 요청마다 전체 프레임을 복사하지 않음
+RANK_COLUMNS = ["단지명", "추천가격", "평형", "세대수", "준공연도", "건축유형", "통합_점수", "역세권_우선", "노선_우선"]
+
+
+def _line_order(line):
+    return (LINES.index(line), line) if line in LINES else (len(LINES), line)
+
+
+@dataclass(frozen=True)
+class Profile:
+    """사용자 입력 조건 (단지 규모는 내부 값: 대단지, 소단지 (300세대 이상) 등)"""
+    cash: float
+    loan: float
+    area_group: str = "상관없음"
+    condition: str = "상관없음"
+    lines: tuple = ()
+    household: str = "상관없음"
+
+    @property
+    def total_budget(self):
+        return self.cash + self.loan
+
+    @property
+    def budget_upper(self):
+        return self.total_budget * 1.1  # +10% 추가 예산
+
+    def normalized(self):
+        """같은 입력을 같은 값으로: 노선은 선택지 순서로 정렬, '상관없음' 포함 시 빈 목록, 단지 규모는 내부 값"""
+        lines = () if "상관없음" in self.lines else tuple(sorted(set(self.lines), key=_line_order))
+        return Profile(float(self.cash), float(self.loan), self.area_group, self.condition,
+                       lines, HOUSEHOLD_LABELS.get(self.household, self.household))
+
+    @property
+    def criteria(self):
+        """점수 계산에 쓰이는 조건 (예산 제외)"""
+        return (self.area_group, self.condition, tuple(self.lines), self.household)
+
+
+def get_condition_note(cash, loan, area_group, condition, lines, household, row):
+    """사용자 조건 설명"""
+    total_budget = cash + loan
+    budget_upper = total_budget * 1.1
+    notes = []
+    mismatch_flags = []  # 조건별 불일치 여부 저장
+
+    if cash > 0:
+        notes.append(f"현금 {cash}억")
+    if loan > 0:
+        notes.append(f"대출 {loan}억")
+
+    # ① 평형
+    actual_pyeong = row["평형"]
+    p_min, p_max = get_area_range(area_group)
+    if area_group != "상관없음":
+        if p_min <= actual_pyeong <= p_max:
+            notes.append(f"{area_group}")
+            mismatch_flags.append(False)
+        else:
+            mismatch_flags.append(True)
+
+    # ② 건물 컨디션
+    if condition != "상관없음":
+        building_type = str(row.get("건축유형", "")).strip()
+        if condition == "신축" and (row['준공연도'] >= 2018 or building_type == "신축"):
+            notes.append("신축")
+            mismatch_flags.append(False)
+        elif condition == building_type:
+            notes.append(f"{condition}")
+            mismatch_flags.append(False)
+        else:
+            mismatch_flags.append(True)
+
+    # ③ 노선
+    if lines and "상관없음" not in lines:
+        if row['역세권'] == "Y" and any(line in str(row.get("노선", "")) for line in lines):
+            notes.append(f"{', '.join(lines)} 노선")
+        # ✅ mismatch_flags.append(False) 또는 append(True) 하지 않음!
+        # → 조건설명은 추가되지만 평가에는 영향 안 미침
+
+    # ④ 단지 규모
+    if household != "상관없음":
+        세대수 = row['세대수'] if pd.notna(row['세대수']) else 0
+        if household == "대단지" and 세대수 >= 1000:
+            notes.append("대단지")
+            mismatch_flags.append(False)
+        elif household == "소단지 (300세대 이상)" and 300 <= 세대수 < 1000:
+            notes.append("소단지 (300세대 이상)")
+            mismatch_flags.append(False)
+        elif household == "소단지 (300세대 이하)" and 세대수 < 300:
+            notes.append("소단지 (300세대 이하)")
+            mismatch_flags.append(False)
+        else:
+            mismatch_flags.append(True)
+    # 예산 조건
+    추천가격 = row['추천가격']
+    if pd.notna(추천가격):
+        _, 예산초과여부 = classify_recommendation(row, budget_upper, total_budget)
+        if 예산초과여부:
+            mismatch_flags.append(True)
+        else:
+            mismatch_flags.append(False)
+
+    # ✅ 최종 판단
+    condition_mismatch = any(mismatch_flags) if mismatch_flags else False
+
+    # 출력용 조건 텍스트
+    condition_text = "입력하신 조건(" + ", ".join(notes) + ")에 따라 추천된 단지입니다." if notes else "입력하신 조건을 기반으로 추천된 단지입니다."
+
+    return condition_text, condition_mismatch
+
+
+def classify_recommendation(row, budget_upper, total_budget):
+    """예산 대비 추천가격 수준에 따른 추천 사유와 예산 초과 여부"""
+    price = row['추천가격']
+    if pd.isna(price):
+        return "가격 정보가 부족하여 신중한 판단이 필요합니다.", True
+    if total_budget <= 0:
+        # 폼에서 현금/대출을 모두 0으로 입력한 경우: 초과 비율을 계산할 수 없음
+        return f"입력하신 예산이 없어 추천 대상에서 제외되어야 하지만, 입력하신 조건을 감안하여 추천하는 단지 입니다. (약 {round(price, 0)}억 필요)", True
+
+    초과금액 = round(price - total_budget, 0)
+    초과비율 = round(초과금액 / total_budget * 100, 1) if 초과금액 > 0 else 0
+
+    if price <= total_budget:
+        return "예산 뿐만 아니라 다른 조건을 모두 만족하는 단지입니다.", False
+    elif price <= budget_upper:
+        return f"예산을 약 {초과비율}% 초과하지만 다른 조건에 부합하거나 고려해볼만하여 추천드립니다. (약 {초과금액}억 추가 필요)", True
+    else:
+        return f"예산 대비 {초과비율}% 초과로 추천 대상에서 제외되어야 하지만, 입력하신 조건을 감안하여 추천하는 단지 입니다. (약 {초과금액}억 초과)", True
+
+
+def describe(candidates, scored, positions, profile):
+    """선정된 후보 위치에 점수, 예산차이, 조건설명/추천이유 열을 붙인 결과 프레임"""
+    picked = scored.iloc[positions]
+    result = candidates.iloc[positions].assign(
+        점수=picked['점수'].to_numpy(),
+        상관_점수=picked['상관_점수'].to_numpy(),
+        예산차이=(picked['추천가격'] - profile.total_budget).abs().to_numpy(),
+    ).reset_index(drop=True)
+    notes = [
+        get_condition_note(profile.cash, profile.loan, profile.area_group, profile.condition,
+                           list(profile.lines), profile.household, row)
+        for _, row in result.iterrows()
+    ]
+    reasons = [classify_recommendation(row, profile.budget_upper, profile.total_budget) for _, row in result.iterrows()]
+    result['조건설명'] = [text for text, _ in notes]
+    result['조건불일치'] = [mismatch for _, mismatch in notes]
+    result['추천이유'] = [text for text, _ in reasons]
+    result['예산초과여부'] = [over for _, over in reasons]
+    return result
+
+
+def _score(dataset, profile):
+    # 조건 선택지별 점수 성분은 데이터셋에 미리 계산되어 있어 조건이 바뀌면 더하기만 한다
+    with stage("scoring", rows_in=len(dataset.candidates)):
+        score, correlated = dataset.score_components.scores(*profile.criteria)
+        scored = dataset.candidates[RANK_COLUMNS].assign(점수=score, 상관_점수=correlated)
+        return scored, RankingKeys(scored, dataset.price_index.complex_codes)
+
+
+def similar_complexes(dataset, name, limit=5, max_price=None, district=None):
+    """단지와 비슷한 단지의 최저가 매물 (가까운 순, 최저가가 max_price 이하인 단지만)
+
+    단지명이 여러 법정동에 있으면 district를 지정해야 한다 (아니면 ValueError).
+    """
+    slot = dataset.similar.slot(name, district)
+    if slot is None:
+        raise ValueError(f"알 수 없는 단지입니다: {name!r}")
+    neighbours = dataset.similar.similar(slot, limit, max_price)
+    slots = [neighbour for neighbour, _ in neighbours]
+    result = dataset.candidates.iloc[dataset.similar.cheapest[slots]]
+    return result.assign(거리=[distance for _, distance in neighbours]).reset_index(drop=True)
+
+
+def _recommend_scored(dataset, scored, keys, profile):
+    positions = rank_candidates(keys, profile, dataset.price_index, TOP_N)
+    with stage("describe", rows_in=len(positions)):
+        result = describe(dataset.candidates, scored, positions, profile)
+    with stage("similar", rows_in=len(result)):
+        # 결과 행의 단지 코드로 찾고 제외하므로 법정동만 다른 같은 이름 단지와 섞이지 않는다
+        slots = dataset.similar.slots(dataset.price_index.complex_codes[positions])
+        result['비슷한단지'] = [
+            [dataset.similar.key(neighbour) for neighbour, _ in
+             dataset.similar.similar(slot, SIMILAR_N, profile.budget_upper, exclude=slots)]
+            for slot in slots
+        ]
+    return result
+
+
+def recommend(profile, dataset=None):
+    """단일 사용자 조건에 대한 추천 결과 (최대 TOP_N행 DataFrame)"""
+    if dataset is None:
+        dataset = load_dataset(DATA_FILE)
+    return _recommend_scored(dataset, *_score(dataset, profile), profile)
+
+
+def recommend_batch(profiles, dataset=None):
+    """여러 사용자 조건을 하나의 데이터셋으로 일괄 추천 (입력 순서대로 결과 목록 반환)
+
+    데이터셋 전처리는 한 번만, 점수 계산과 정렬 키 생성은 예산을 제외한 조건 조합마다 한 번만 수행한다.
+    """
+    if dataset is None:
+        dataset = load_dataset(DATA_FILE)
+    scored_by_criteria = {}
+    results = []
+    for profile in profiles:
+        scored = scored_by_criteria.get(profile.criteria)
+        if scored is None:
+            scored = scored_by_criteria[profile.criteria] = _score(dataset, profile)
+        results.append(_recommend_scored(dataset, *scored, profile))
+    return results
+
+
+def budget_points(low, high, step):
+    """low부터 high까지 step 간격의 총예산 지점 (억, 소수 둘째 자리 반올림)"""
+    if step <= 0 or low < 0 or high < low:
+        raise ValueError("예산 범위는 0 <= 최소 <= 최대, 간격은 0보다 커야 합니다.")
+    count = int(np.floor((high - low) / step + 1e-9)) + 1
+    if count > SWEEP_MAX_POINTS:
+        raise ValueError(f"예산 지점이 너무 많습니다 ({count}개, 최대 {SWEEP_MAX_POINTS}개).")
+    return [round(low + i * step, 2) for i in range(count)]
+
+
+def with_budget(profile, total_budget):
+    """대출 금액은 유지하고 현금으로 총예산을 맞춘 조건 (총예산이 대출보다 작으면 전액 대출)"""
+    loan = min(profile.loan, total_budget)
+    return replace(profile, cash=round(total_budget - loan, 2), loan=loan)
+
+
+def sweep_budgets(profile, budgets, dataset=None):
+    """총예산 지점별 상위 TOP_N 단지 표와 단지별 최초 진입 예산 요약
+
+    예산과 무관한 점수 계산/정렬 키는 한 번만 만들고, 예산 지점마다 가격 색인 조회와 부분 선택만 다시 한다.
+    (표: 예산, 순위, 단지명, 평형, 추천가격, 예산차이, 예산초과여부 / 요약: 단지명, 진입예산, 진입순위, 추천가격, 등장횟수)
+    """
+    if dataset is None:
+        dataset = load_dataset(DATA_FILE)
+    scored, keys = _score(dataset, profile)
+    rows = []
+    with stage("sweep", rows_in=len(budgets)) as timing:
+        for budget in budgets:
+            positions = rank_candidates(keys, with_budget(profile, budget), dataset.price_index, TOP_N)
+            picked = scored.iloc[positions]
+            prices = picked['추천가격'].to_numpy(dtype=float)
+            rows.append(pd.DataFrame({
+                '예산': budget,
+                '순위': np.arange(1, len(positions) + 1),
+                '단지명': picked['단지명'].astype(object).to_numpy(),
+                '평형': picked['평형'].to_numpy(dtype=float),
+                '추천가격': prices,
+                '예산차이': np.abs(prices - budget),
+                '예산초과여부': prices > budget,
+            }))
+        table = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(
+            columns=['예산', '순위', '단지명', '평형', '추천가격', '예산차이', '예산초과여부'])
+        timing.rows_out = len(table)
+    entries = table.drop_duplicates('단지명')  # 예산 오름차순이므로 단지별 첫 행이 최초 진입
+    summary = pd.DataFrame({
+        '단지명': entries['단지명'].to_numpy(),
+        '진입예산': entries['예산'].to_numpy(),
+        '진입순위': entries['순위'].to_numpy(),
+        '추천가격': entries['추천가격'].to_numpy(),
+        '등장횟수': table['단지명'].value_counts().reindex(entries['단지명']).to_numpy(),
+    })
+    return table, summary
@@ -0,0 +1,82 @@
+"""추천가격 정렬 색인: 예산 구간 조회를 이진 탐색 범위로 처리"""
+import numpy as np
+import pandas as pd
+
+from proxity.scoring import AREA_GROUPS, HOUSEHOLDS, get_area_range
+
+
+def area_filter_mask(candidates, area_group):
+    """평형 조건 필터 (평형 결측은 제외)"""
+    p_min, p_max = get_area_range(area_group)
+    return ((candidates['평형'] >= p_min) & (candidates['평형'] <= p_max)).to_numpy()
+
+
+def household_filter_mask(candidates, household):
+    """세대수 조건 필터 (세대수 결측은 제외)"""
+    세대수 = candidates['세대수']
+    if household == "대단지":
+        return (세대수 >= 1000).to_numpy()
+    elif household == "소단지 (300세대 이상)":
+        return ((세대수 >= 300) & (세대수 < 1000)).to_numpy()
+    elif household == "소단지 (300세대 이하)":
+        return (세대수 < 300).to_numpy()
+    return np.ones(len(candidates), dtype=bool)
+
+
+def new_build_filter_mask(candidates):
+    """신축 조건 필터 (2018년 이후 준공 또는 건축유형 신축)"""
+    return ((candidates['준공연도'] >= 2018) | (candidates['건축유형'] == "신축")).to_numpy()
+
+
+class PriceIndex:
+    """추천가격 오름차순 위치 색인과 평형대/세대수 구간별 보조 마스크, 단지 코드
+
+    조회 결과는 후보 프레임의 위치(iloc)이며 원래 행 순서로 정렬되어
+    기존 불리언 필터와 같은 순서의 부분 집합을 돌려준다.
+    """
+
+    def __init__(self, candidates, complex_columns=('단지명',)):
+        prices = candidates['추천가격'].to_numpy(dtype=float)
+        self.order = np.argsort(prices, kind="stable")
+        self.prices = prices[self.order]
+        self.pyeong = candidates['평형'].to_numpy(dtype=float)
+        # 단지 코드 (결측 단지명은 하나의 단지로 취급: drop_duplicates와 동일)
+        if list(complex_columns) == ['단지명']:
+            codes, names = pd.factorize(candidates['단지명'])
+            self.complex_codes = np.where(codes < 0, len(names), codes)
+        else:
+            # 여러 법정동을 합친 데이터: 동이 다르면 단지명이 같아도 다른 단지
+            self.complex_codes = candidates.groupby(list(complex_columns), sort=False, dropna=False,
+                                                    observed=True).ngroup().to_numpy()
+        self.area_masks = {g: area_filter_mask(candidates, g) for g in AREA_GROUPS if g != "상관없음"}
+        self.household_masks = {h: household_filter_mask(candidates, h) for h in HOUSEHOLDS if h != "상관없음"}
+        self.new_build_mask = new_build_filter_mask(candidates)
+
+    def __len__(self):
+        return len(self.order)
+
+    def area_mask(self, area_group):
+        """평형대 필터 마스크 (폼에 없는 값은 get_area_range 기본 범위 사용)"""
+        mask = self.area_masks.get(area_group)
+        if mask is None:
+            p_min, p_max = get_area_range(area_group)
+            mask = (self.pyeong >= p_min) & (self.pyeong <= p_max)
+        return mask
+
+    def price_range(self, low=-np.inf, high=np.inf, low_inclusive=True, high_inclusive=True):
+        """low~high 추천가격 구간에 속하는 후보 위치 (원래 행 순서)"""
+        start = np.searchsorted(self.prices, low, side="left" if low_inclusive else "right")
+        stop = np.searchsorted(self.prices, high, side="right" if high_inclusive else "left")
+        return np.sort(self.order[start:max(start, stop)])
+
+    def lookup(self, low=-np.inf, high=np.inf, low_inclusive=True, high_inclusive=True,
+               area_group="상관없음", household="상관없음", new_build=False):
+        """가격 구간 조회 후 평형대/세대수/신축 조건으로 좁힌 후보 위치"""
+        positions = self.price_range(low, high, low_inclusive, high_inclusive)
+        if area_group != "상관없음":
+            positions = positions[self.area_mask(area_group)[positions]]
+        if household in self.household_masks:
+            positions = positions[self.household_masks[household][positions]]
+        if new_build:
+            positions = positions[self.new_build_mask[positions]]
+        return positions
@@ -0,0 +1,240 @@
+"""날짜별 가격 관측 저장소 (long format)와 일별 가격 델타 반영
+
+원본 CSV의 시점별 가격 열('20250521호가', '2025.03' 등)은 로드할 때 한 번
+(행, 구분, 기준일, 가격, 거래일) 관측으로 풀어 저장하고, 이후 가격 갱신은
+(단지명, 전용면적) 기준의 날짜별 델타 파일로 추가한다.
+
+델타 CSV 열: 기준일, 구분(호가/실거래), 단지명, 전용면적, 가격(억)
+  - 실거래의 기준일은 거래일이다.
+  - 호가 가격이 비어 있으면 해당 기준일에 매물이 없어진 것으로 본다.
+  - 가격은 0보다 큰 숫자(억)여야 한다. '29.5억'처럼 숫자가 아닌 값이나 0 이하는 오류.
+
+    python -m proxity.prices delta.csv [--data data/jw_v0.13_streamlit_ready.csv]
+
+명령은 델타를 검증한 뒤 데이터 파일 옆 <이름>.deltas/ 폴더에 복사한다. 실행 중인 앱과
+API 서버는 다음 요청에서 새 델타만 반영한다(전체 재전처리/재시작 없음).
+"""
+import argparse
+import glob
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+ASKING = "호가"
+TRADE = "실거래"
+ESTIMATE = "추정실거래"
+QUARTER = "분기평균"
+KINDS = [ASKING, TRADE, ESTIMATE, QUARTER]
+# 델타 파일로 갱신할 수 있는 구분
+DELTA_KINDS = [ASKING, TRADE]
+
+# 원본 CSV의 시점별 가격 열 -> (구분, 기준일)
+SNAPSHOT_COLUMNS = {
+    '20250521호가': (ASKING, '2025-05-21'),
+    '2025.03': (TRADE, '2025-03-31'),
+    '2025.05_보정_추정실거래가': (ESTIMATE, '2025-05-31'),
+    '2024.01~03': (QUARTER, '2024-03-31'),
+    '2022.01~03': (QUARTER, '2022-03-31'),
+}
+# 구분별 최신 관측이 들어가는 매물 열
+CURRENT_COLUMNS = {ASKING: '현재호가', TRADE: '실거래가', ESTIMATE: '추정가'}
+# 시점별 가격으로 계산하는 추세 지표 (비율, 0.1 = +10%)
+TREND_COLUMNS = ['상승률_2022', '상승률_2024', '호가괴리율', '평단가_보정률']
+DELTA_COLUMNS = ['기준일', '구분', '단지명', '전용면적', '가격']
+DELTA_SUFFIX = ".deltas"
+
+
+def _observations(rows, kind, dates, prices, traded=None):
+    return pd.DataFrame({
+        '행': np.asarray(rows, dtype=np.int64),
+        '구분': pd.Categorical.from_codes(np.full(len(rows), KINDS.index(kind)), categories=KINDS),
+        '기준일': pd.to_datetime(dates),
+        '가격': np.asarray(prices, dtype=float),
+        '거래일': pd.to_datetime(traded if traded is not None else pd.NaT),
+    })
+
+
+def price_history(listings):
+    """전처리된 매물의 시점별 가격 열을 가격이 있는 관측만 long format으로 풀기
+
+    실거래 관측의 기준일은 거래일(없으면 열의 기준 시점)이다.
+    """
+    frames = []
+    for column, (kind, date) in SNAPSHOT_COLUMNS.items():
+        source = CURRENT_COLUMNS.get(kind, column)
+        prices = pd.to_numeric(listings[source], errors='coerce').astype(float)
+        observed = prices.notna().to_numpy()
+        rows = listings.index[observed]
+        if kind == TRADE:
+            traded = listings['거래일'].to_numpy()[observed]
+            dates = pd.Series(traded).fillna(pd.Timestamp(date))
+            frames.append(_observations(rows, kind, dates, prices[observed], traded))
+        else:
+            frames.append(_observations(rows, kind, np.full(len(rows), np.datetime64(date, 'ns')), prices[observed]))
+    return pd.concat(frames, ignore_index=True)
+
+
+def history_columns(listings):
+    """long format으로 옮겨 매물 프레임에서 빼도 되는 시점별 가격 열"""
+    return [column for column in SNAPSHOT_COLUMNS if column in listings]
+
+
+def latest_prices(history, rows, kind):
+    """행별 해당 구분의 가장 최근 관측 (기준일이 같으면 나중에 추가된 관측), 행 기준 색인"""
+    observed = history[(history['구분'] == kind) & history['행'].isin(rows)]
+    latest = observed.sort_values('기준일', kind='stable').drop_duplicates('행', keep='last')
+    return latest.set_index('행')[['가격', '거래일']]
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator - 1 (둘 중 하나가 결측이거나 분모가 0 이하이면 NaN)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / denominator - 1, np.nan)
+
+
+def _observed_at(history, index, kind, date):
+    """해당 구분·기준일 관측 가격을 매물 행 순서 배열로 (관측 없으면 NaN)"""
+    values = np.full(len(index), np.nan)
+    observed = history[(history['구분'] == kind) & (history['기준일'] == pd.Timestamp(date))]
+    positions = index.get_indexer(observed['행'])
+    found = positions >= 0
+    values[positions[found]] = observed['가격'].to_numpy()[found]
+    return values
+
+
+def trend_features(listings, history):
+    """모든 매물의 가격 추세 지표를 한 번에 계산 (매물과 같은 색인의 TREND_COLUMNS 프레임)
+
+    - 상승률_2022/2024: 현재 실거래가 / 해당 연도 1분기 평균 실거래가 - 1
+    - 호가괴리율: 현재 호가 / 현재 실거래가 - 1 (추정 호가 제외)
+    - 평단가_보정률: 보정_평단가 / 기준단지_평단가 - 1
+    """
+    trade = listings['실거래가'].to_numpy(dtype=float)
+    quarters = {column[:4]: _observed_at(history, listings.index, kind, date)
+                for column, (kind, date) in SNAPSHOT_COLUMNS.items() if kind == QUARTER}
+    return pd.DataFrame({
+        '상승률_2022': _ratio(trade, quarters['2022']),
+        '상승률_2024': _ratio(trade, quarters['2024']),
+        '호가괴리율': _ratio(listings['현재호가'].to_numpy(dtype=float), trade),
+        '평단가_보정률': _ratio(listings['보정_평단가'].to_numpy(dtype=float),
+                            listings['기준단지_평단가'].to_numpy(dtype=float)),
+    }, index=listings.index)
+
+
+def load_price_delta(path):
+    """델타 CSV를 읽어 검증 (열 누락, 알 수 없는 구분, 날짜/가격 형식 오류는 ValueError)"""
+    delta = pd.read_csv(path)
+    missing = [column for column in DELTA_COLUMNS if column not in delta]
+    if missing:
+        raise ValueError(f"{path}: 필수 열 누락 ({', '.join(missing)})")
+    delta = delta[DELTA_COLUMNS].copy()
+    unknown = sorted(set(delta['구분']) - set(DELTA_KINDS))
+    if unknown:
+        raise ValueError(f"{path}: 알 수 없는 구분 {unknown} (가능한 값: {', '.join(DELTA_KINDS)})")
+    # 원본에서 비어 있던 칸만 매물 없어짐으로 보고, 숫자로 읽히지 않는 값('29.5억' 등)은 오류
+    blank = delta['가격'].isna() | (delta['가격'].astype(str).str.strip() == "")
+    delta['기준일'] = pd.to_datetime(delta['기준일'], errors='coerce')
+    delta['전용면적'] = pd.to_numeric(delta['전용면적'], errors='coerce')
+    delta['가격'] = pd.to_numeric(delta['가격'].mask(blank), errors='coerce')
+    invalid = delta['기준일'].isna() | delta['전용면적'].isna() | delta['단지명'].isna()
+    invalid |= (delta['구분'] == TRADE) & blank
+    if invalid.any():
+        raise ValueError(f"{path}: 기준일/단지명/전용면적이 비었거나 가격 없는 실거래가 있는 행 {int(invalid.sum())}개")
+    malformed = ~blank & (delta['가격'].isna() | (delta['가격'] <= 0))
+    if malformed.any():
+        rows = ", ".join(str(row + 2) for row in np.flatnonzero(malformed)[:10])
+        raise ValueError(f"{path}: 가격이 0보다 큰 숫자(억)가 아닌 행 {int(malformed.sum())}개 (CSV {rows}행)")
+    return delta
+
+
+def _listing_keys(listings):
+    return pd.DataFrame({
+        '단지명': listings['단지명'].astype(object).to_numpy(),
+        '전용면적': listings['전용면적'].to_numpy(dtype=float).round(2),
+        '행': listings.index.to_numpy(dtype=np.int64),
+    })
+
+
+def match_delta(listings, delta):
+    """델타 관측을 (단지명, 전용면적 소수 둘째 자리)가 같은 매물 행에 연결 (같은 키의 매물이 여럿이면 모두)
+
+    (관측 프레임, 매물과 연결되지 않은 델타 행 수) 반환
+    """
+    delta = delta.assign(전용면적=delta['전용면적'].round(2), 순서=np.arange(len(delta)))
+    matched = delta.merge(_listing_keys(listings), on=['단지명', '전용면적'], how='left')
+    unmatched = int(matched.loc[matched['행'].isna(), '순서'].nunique())
+    matched = matched[matched['행'].notna()].sort_values('순서', kind='stable')
+    frames = [
+        _observations(part['행'], kind, part['기준일'], part['가격'], part['기준일'] if kind == TRADE else None)
+        for kind, part in matched.groupby('구분', sort=False)
+    ]
+    observations = pd.concat(frames, ignore_index=True) if frames else _observations([], ASKING, [], [])
+    return observations, unmatched
+
+
+def apply_observations(listings, history, observations):
+    """관측을 저장소에 추가하고, 관측이 들어온 (행, 구분)의 최신 가격 열만 다시 계산
+
+    (새 매물 프레임, 새 저장소, 관측이 들어온 단지명 집합) 반환
+    """
+    history = pd.concat([history, observations], ignore_index=True)
+    listings = listings.copy()
+    for kind in observations['구분'].unique():
+        rows = observations.loc[observations['구분'] == kind, '행'].unique()
+        latest = latest_prices(history, rows, kind)
+        column = CURRENT_COLUMNS[kind]
+        values = listings[column].astype(float)
+        values.loc[latest.index] = latest['가격']
+        listings[column] = values
+        if kind == TRADE:
+            listings.loc[latest.index, '거래일'] = latest['거래일']
+            listings['거래연도'] = listings['거래일'].dt.year
+    touched = listings.index.isin(observations['행'])
+    return listings, history, set(listings.loc[touched, '단지명'].astype(object))
+
+
+def delta_dir(data_path):
+    """데이터 파일에 대응하는 델타 폴더 경로"""
+    return os.path.splitext(data_path)[0] + DELTA_SUFFIX
+
+
+def delta_files(data_path):
+    """반영 순서(파일명 순)대로 정렬한 델타 파일의 (경로, mtime, 크기) 목록"""
+    paths = sorted(glob.glob(os.path.join(delta_dir(data_path), "*.csv")))
+    return tuple((path, *_stat(path)) for path in paths)
+
+
+def _stat(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def main(argv=None):
+    from proxity.dataset import DATA_FILE, load_dataset
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("delta", help="날짜별 가격 델타 CSV")
+    parser.add_argument("--data", default=DATA_FILE, help="델타를 반영할 매물 CSV")
+    args = parser.parse_args(argv)
+
+    try:
+        dataset = load_dataset(args.data)
+        observations, unmatched = match_delta(dataset.listings, load_price_delta(args.delta))
+    except (OSError, ValueError) as e:
+        print(e)
+        return 1
+    target = os.path.join(delta_dir(args.data), os.path.basename(args.delta))
+    if os.path.exists(target):
+        print(f"{target} 파일이 이미 있습니다. 날짜가 들어간 새 파일명을 사용하세요.")
+        return 1
+    os.makedirs(delta_dir(args.data), exist_ok=True)
+    shutil.copyfile(args.delta, target + ".tmp")
+    os.replace(target + ".tmp", target)
+    print(f"{args.delta} -> {target}: 관측 {len(observations)}건, 매물 없음 {unmatched}행")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
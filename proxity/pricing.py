@@ -0,0 +1,101 @@
+"""동일 단지 유사 평형 호가 추정 (단지별 전용면적 정렬 색인)"""
+import math
+
+import numpy as np
+import pandas as pd
+
+ESTIMATED_SOURCE = "동일단지 유사평형 호가 추정"
+ASKING_SOURCE = "호가"
+
+# 단지 코드와 전용면적 내림값을 하나의 정렬 키로 합칠 때 쓰는 자리수
+_AREA_SLOTS = 1 << 32
+
+
+def estimate_similar_asking_price(row, df):
+    """동일 단지 내 유사 평형 호가 추정 (행 단위 기준 구현)"""
+    if pd.isna(row['현재호가']):
+        complex_name = row['단지명']
+        target_area = math.floor(row['전용면적'])
+        similar_units = df[(df['단지명'] == complex_name) & df['현재호가'].notna()]
+        if not similar_units.empty:
+            similar_units['면적차이'] = abs(similar_units['전용면적'].apply(math.floor) - target_area)
+            closest_unit = similar_units.loc[similar_units['면적차이'].idxmin()]
+            closest_area = closest_unit['전용면적']
+            closest_price = closest_unit['현재호가']
+            estimated_price = (closest_price / closest_area) * row['전용면적']
+            return estimated_price, ESTIMATED_SOURCE, closest_area
+    return row['현재호가'], ASKING_SOURCE, row['전용면적']
+
+
+class AskingPriceIndex:
+    """호가가 있는 매물을 (단지, 전용면적 내림값) 순으로 정렬한 색인
+
+    같은 (단지, 내림값)에는 원래 프레임에서 가장 앞선 매물만 남겨
+    기존 idxmin과 같은 동률 처리를 따른다.
+    """
+
+    def __init__(self, complex_codes, areas, prices):
+        quoted = (complex_codes >= 0) & ~np.isnan(prices) & ~np.isnan(areas)
+        positions = np.flatnonzero(quoted)
+        keys = self._keys(complex_codes[positions], np.floor(areas[positions]))
+        # 키 정렬 후 키별 첫 위치만 유지 (stable 정렬이라 원래 순서가 보존됨)
+        order = np.argsort(keys, kind="stable")
+        keys, positions = keys[order], positions[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        self.keys = keys[first]
+        self.positions = positions[first]
+        self.areas = areas[self.positions]
+        self.prices = prices[self.positions]
+
+    @staticmethod
+    def _keys(complex_codes, floors):
+        return complex_codes.astype(np.int64) * _AREA_SLOTS + floors.astype(np.int64)
+
+    def nearest(self, complex_codes, areas):
+        """단지별 전용면적 내림값 차이가 가장 작은 호가 매물의 색인 위치 (-1: 없음)"""
+        result = np.full(len(complex_codes), -1, dtype=np.int64)
+        valid = (complex_codes >= 0) & ~np.isnan(areas)
+        if not valid.any() or len(self.keys) == 0:
+            return result
+        codes = complex_codes[valid].astype(np.int64)
+        floors = np.floor(areas[valid]).astype(np.int64)
+        right = np.searchsorted(self.keys, self._keys(codes, floors), side="left")
+        left = right - 1
+        n = len(self.keys)
+        right_ok = right < n
+        right_ok[right_ok] = self.keys[right[right_ok]] // _AREA_SLOTS == codes[right_ok]
+        left_ok = left >= 0
+        left_ok[left_ok] = self.keys[left[left_ok]] // _AREA_SLOTS == codes[left_ok]
+        right_c = np.where(right_ok, right, 0)
+        left_c = np.where(left_ok, left, 0)
+        right_diff = np.where(right_ok, self.keys[right_c] % _AREA_SLOTS - floors, np.iinfo(np.int64).max)
+        left_diff = np.where(left_ok, floors - self.keys[left_c] % _AREA_SLOTS, np.iinfo(np.int64).max)
+        # 차이가 같으면 원래 프레임에서 앞선 매물 선택
+        take_left = (left_diff < right_diff) | (
+            (left_diff == right_diff) & (self.positions[left_c] < self.positions[right_c])
+        )
+        chosen = np.where(take_left, left_c, right_c)
+        chosen[~(left_ok | right_ok)] = -1
+        result[valid] = chosen
+        return result
+
+
+def fill_asking_prices(df):
+    """호가가 없는 매물에 동일 단지 유사 평형 호가 추정치를 채운 현재호가/가격출처/호가전용면적 반환"""
+    complex_codes, _ = pd.factorize(df['단지명'])
+    areas = df['전용면적'].to_numpy(dtype=float)
+    prices = df['현재호가'].to_numpy(dtype=float)
+    index = AskingPriceIndex(complex_codes, areas, prices)
+
+    asking = prices.copy()
+    asking_area = areas.copy()
+    source = np.full(len(df), ASKING_SOURCE, dtype=object)
+    missing = np.flatnonzero(np.isnan(prices))
+    nearest = index.nearest(complex_codes[missing], areas[missing])
+    found = nearest >= 0
+    rows, slots = missing[found], nearest[found]
+    asking[rows] = (index.prices[slots] / index.areas[slots]) * areas[rows]
+    asking_area[rows] = index.areas[slots]
+    source[rows] = ESTIMATED_SOURCE
+    return pd.DataFrame({'현재호가': asking, '가격출처': source, '호가전용면적': asking_area}, index=df.index)
@@ -0,0 +1,143 @@
+"""요청 단위 단계별 시간/행 수 계측과 선택적 cProfile 수집
+
+with trace_request("app.submit") as trace: 안에서 stage("scoring", rows_in=n)으로 감싼 구간이
+trace.stages에 기록되고, 요청이 끝나면 proxity.timing 로거로 JSON 한 줄을 남긴다.
+활성 trace가 없으면 stage()는 시간만 재고 버린다.
+
+로깅 설정이 없는 프로세스(Streamlit 앱 등)에서는 PROXITY_TIMING_LOG=1(표준 오류) 또는
+PROXITY_TIMING_LOG=<파일 경로>로 configure_timing_log()가 JSON lines 핸들러를 붙인다.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+logger = logging.getLogger("proxity.timing")
+
+PROFILE_ENV = "PROXITY_PROFILE"
+DEBUG_ENV = "PROXITY_DEBUG"
+TIMING_LOG_ENV = "PROXITY_TIMING_LOG"
+
+_current_trace = contextvars.ContextVar("proxity_trace", default=None)
+
+
+def env_flag(name):
+    """환경 변수 on/off 값 해석"""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def configure_timing_log(target=None):
+    """proxity.timing 로거에 JSON lines 핸들러 연결 (여러 번 호출해도 한 번만)
+
+    target이 None이면 PROXITY_TIMING_LOG를 따른다: 꺼져 있으면 아무것도 하지 않고,
+    1/true/yes/on/stderr이면 표준 오류, 그 밖의 값은 덧붙여 쓸 파일 경로로 본다.
+    연결한 핸들러를 반환한다 (설정하지 않았으면 None).
+    """
+    if target is None:
+        target = os.environ.get(TIMING_LOG_ENV, "").strip()
+    if not target or target.lower() in ("0", "false", "no", "off"):
+        return None
+    for handler in logger.handlers:
+        if getattr(handler, "_proxity_timing", False):
+            return handler
+    if env_flag(TIMING_LOG_ENV) or target.lower() == "stderr":
+        handler = logging.StreamHandler(sys.stderr)
+    else:
+        handler = logging.FileHandler(target, encoding="utf-8")
+    handler._proxity_timing = True
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    # 루트 로거 설정과 상관없이 한 줄에 JSON 하나만 남도록 전파하지 않음
+    logger.propagate = False
+    return handler
+
+
+@dataclass
+class StageTiming:
+    """단계 하나의 소요 시간과 입출력 행 수"""
+    name: str
+    elapsed_ms: float = 0.0
+    rows_in: int = None
+    rows_out: int = None
+
+
+@dataclass
+class RequestTrace:
+    """요청 하나의 단계별 기록"""
+    name: str
+    stages: list = field(default_factory=list)
+    total_ms: float = 0.0
+    profile_text: str = None
+
+    def as_dict(self):
+        return {
+            "event": "request_timing",
+            "request": self.name,
+            "total_ms": round(self.total_ms, 3),
+            "stages": [{**asdict(s), "elapsed_ms": round(s.elapsed_ms, 3)} for s in self.stages],
+        }
+
+    def stage_totals(self):
+        """단계 이름별 누적 시간 (ms)"""
+        totals = {}
+        for s in self.stages:
+            totals[s.name] = totals.get(s.name, 0.0) + s.elapsed_ms
+        return totals
+
+
+def current_trace():
+    """현재 실행 흐름의 활성 trace (없으면 None)"""
+    return _current_trace.get()
+
+
+@contextmanager
+def stage(name, rows_in=None):
+    """계측 구간: yield된 StageTiming의 rows_out을 채우면 함께 기록된다"""
+    timing = StageTiming(name, rows_in=rows_in)
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        timing.elapsed_ms = (time.perf_counter() - start) * 1000
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.stages.append(timing)
+
+
+@contextmanager
+def trace_request(name, profile=None):
+    """요청 단위 계측: 종료 시 구조화 로그 기록, profile이 참이면 cProfile 결과를 trace에 저장
+
+    profile이 None이면 PROXITY_PROFILE 환경 변수를 따른다. 이미 활성 trace가 있으면 그대로 이어 쓴다.
+    """
+    parent = _current_trace.get()
+    if parent is not None:
+        yield parent
+        return
+    if profile is None:
+        profile = env_flag(PROFILE_ENV)
+    trace = RequestTrace(name)
+    token = _current_trace.set(trace)
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield trace
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            buffer = io.StringIO()
+            pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(30)
+            trace.profile_text = buffer.getvalue()
+        trace.total_ms = (time.perf_counter() - start) * 1000
+        _current_trace.reset(token)
+        logger.info(json.dumps(trace.as_dict(), ensure_ascii=False))
@@ -0,0 +1,123 @@
+"""순위 선정: 단지별 최선 매물 선택과 부분 선택(top-k)을 한 단계로 처리"""
+import numpy as np
+
+from proxity.profiling import stage
+from proxity.scoring import get_area_range
+
+
+def _descending(values):
+    """내림차순 비교용 키 (작을수록 우선, 결측은 맨 뒤)"""
+    values = np.asarray(values, dtype=float)
+    return np.where(np.isnan(values), np.inf, -values)
+
+
+class RankingKeys:
+    """후보 위치별 정렬 키 배열 (기존 sort_values와 같은 우선순위, 동률은 원래 행 순서)"""
+
+    def __init__(self, scored, complex_codes):
+        self.complex_codes = complex_codes
+        self.price = scored['추천가격'].to_numpy(dtype=float)
+        self.score = scored['점수'].to_numpy(dtype=float)
+        self.correlated = scored['상관_점수'].to_numpy(dtype=float)
+        self.pyeong = scored['평형'].to_numpy(dtype=float)
+        # 점수 → 상관_점수 → 통합_점수 → 역세권_우선 → 노선_우선 (모두 내림차순)
+        self.by_score = [
+            -self.score,
+            -self.correlated,
+            _descending(scored['통합_점수']),
+            _descending(scored['역세권_우선']),
+            _descending(scored['노선_우선']),
+        ]
+        # 추천가격 오름차순 후 위 순서
+        self.by_price = [self.price, *self.by_score]
+
+
+def top_complexes(positions, complex_codes, keys, k, exclude=()):
+    """positions 중 단지별 최선 행을 골라 keys 순서로 상위 k개 단지의 위치 반환
+
+    단지별 1순위 키의 최솟값 중 k번째 값을 부분 선택(np.partition)으로 구해
+    그보다 뒤처지는 행은 정렬 전에 버린다. positions는 원래 행 순서여야 한다.
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    if len(exclude):
+        positions = positions[~np.isin(complex_codes[positions], exclude)]
+    if k <= 0 or len(positions) == 0:
+        return positions[:0]
+
+    primary = keys[0][positions]
+    codes = complex_codes[positions]
+    best = np.full(complex_codes.max() + 1, np.inf)
+    np.minimum.at(best, codes, primary)
+    present = np.zeros(len(best), dtype=bool)
+    present[codes] = True
+    per_complex = best[present]
+    if len(per_complex) > k:
+        threshold = np.partition(per_complex, k - 1)[k - 1]
+        keep = primary <= threshold
+        positions, codes = positions[keep], codes[keep]
+
+    # 남은 행만 정렬 (np.lexsort는 안정 정렬이라 동률은 원래 행 순서 유지)
+    order = np.lexsort([key[positions] for key in reversed(keys)])
+    selected, seen = [], set()
+    for i in order:
+        if codes[i] not in seen:
+            seen.add(codes[i])
+            selected.append(positions[i])
+            if len(selected) == k:
+                break
+    return np.array(selected, dtype=np.int64)
+
+
+def cheapest_per_complex(positions, complex_codes, price):
+    """단지별 최저 추천가격 행 (같은 가격이면 앞선 행) 위치를 원래 행 순서로 반환"""
+    positions = np.asarray(positions, dtype=np.int64)
+    if len(positions) == 0:
+        return positions
+    codes = complex_codes[positions]
+    lowest = np.full(complex_codes.max() + 1, np.inf)
+    np.minimum.at(lowest, codes, price[positions])
+    tied = positions[price[positions] == lowest[codes]]
+    _, first = np.unique(complex_codes[tied], return_index=True)
+    return np.sort(tied[first])
+
+
+def rank_candidates(keys, profile, price_index, k):
+    """예산 내 → 예산 초과 → 15% 이내 초과 순으로 상위 k개 후보 위치 선정"""
+    total_budget = profile.total_budget
+    budget_upper = profile.budget_upper
+    area_group = profile.area_group
+    codes = keys.complex_codes
+
+    # 예산 ±10% 이내, 평형/세대수/신축 조건을 만족하는 단지
+    with stage("filter") as timing:
+        in_budget = price_index.lookup(
+            total_budget * 0.9, budget_upper, area_group=area_group,
+            household=profile.household, new_build=profile.condition == "신축",
+        )
+        timing.rows_in = len(in_budget)
+        top = top_complexes(in_budget, codes, keys.by_score, k)
+        timing.rows_out = len(top)
+    if len(top) == k:
+        return top
+
+    with stage("fallback") as timing:
+        timing.rows_in = len(top)
+        # 보완 1: 예산 초과 단지 중 평형 조건을 만족하는 단지를 가격순으로 추가 후 예산차이순 정렬
+        if len(top) < k:
+            over_budget = price_index.lookup(budget_upper, low_inclusive=False, area_group=area_group)
+            extra = top_complexes(over_budget, codes, keys.by_price, k - len(top), exclude=codes[top])
+            top = np.concatenate([top, extra])
+            budget_gap = np.abs(keys.price[top] - total_budget)
+            top = top[np.lexsort((-keys.correlated[top], -keys.score[top], budget_gap))]
+
+        # 보완 2: 예산 초과 15% 이내에서 단지별 최저가 매물 중 평형 조건을 만족하는 단지
+        if len(top) < k:
+            capped = price_index.price_range(total_budget, total_budget * 1.15, low_inclusive=False)
+            cheapest = cheapest_per_complex(capped, codes, keys.price)
+            if area_group != "상관없음":
+                p_min, p_max = get_area_range(area_group)
+                pyeong = keys.pyeong[cheapest]
+                cheapest = cheapest[(pyeong >= p_min) & (pyeong <= p_max)]
+            top = np.concatenate([top, top_complexes(cheapest, codes, keys.by_price, k - len(top))])
+        timing.rows_out = len(top)
+    return top
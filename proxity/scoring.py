@@ -0,0 +1,232 @@
+"""단지 점수 계산: 행 단위 기준 구현과 열 단위(벡터화) 엔진"""
+
+import numpy as np
+import pandas as pd
+
+AREA_GROUPS = ["상관없음", "10평대", "20평대", "30평대", "40평 이상"]
+CONDITIONS = ["상관없음", "신축", "기축", "리모델링", "재건축"]
+LINES = ["3호선", "7호선", "9호선", "신분당선"]
+HOUSEHOLDS = ["상관없음", "대단지", "소단지 (300세대 이상)", "소단지 (300세대 이하)"]
+# 입력 폼의 단지 규모 선택지 → 내부 값
+HOUSEHOLD_LABELS = {
+    "1000세대 이상 대단지": "대단지",
+    "세대수 300세대 이상": "소단지 (300세대 이상)",
+    "세대수 300세대 이하": "소단지 (300세대 이하)",
+    "상관없음": "상관없음"
+}
+
+
+def get_area_range(area_group):
+    """평형대 범위 반환 (평형 열 기준)"""
+    if area_group == "10평대": return (0, 19.9)
+    elif area_group == "20평대": return (19.9, 29.9)
+    elif area_group == "30평대": return (29.9, 39.9)
+    elif area_group == "40평 이상": return (39.9, 1000)
+    return (0, 1000)
+
+
+# --- 행 단위 기준 구현 (벡터화 엔진의 정합성 기준) ---
+def score_complex(row, cash, loan, area_group, condition, lines, household):
+    """단지 점수 계산: 사용자 조건과 데이터 일치도 기반"""
+    score = 0
+    pyeong = row["평형"]
+    p_min, p_max = get_area_range(area_group)
+    if p_min <= pyeong <= p_max:
+        score += 1.5
+    elif area_group == "상관없음":
+        score += 1
+    building_type = str(row.get("건축유형", "")).strip()
+    if condition == "신축" and (row['준공연도'] >= 2018 or building_type == "신축"):
+        score += 2.5
+    elif condition == "상관없음" or condition == building_type:
+        score += 1.5
+    if "상관없음" not in lines:
+        if row['역세권'] == "Y" and any(line in str(row.get("노선", "")) for line in lines):
+            score += 1.5
+    else:
+        score += 1
+    세대수 = row['세대수'] if pd.notna(row['세대수']) else 0
+    if household == "대단지" and 세대수 >= 1000:
+        score += 1
+    elif household == "소단지 (300세대 이상)" and 300 <= 세대수 < 1000:
+        score += 1
+    elif household == "소단지 (300세대 이하)" and 세대수 < 300:
+        score += 1
+    elif household == "상관없음":
+        score += 1
+    return score
+
+
+def score_correlated_factors(row, area_group, condition, lines, household):
+    """상관 요소(노선, 규모, 컨디션, 평형대)에 따른 추가 점수"""
+    score = 0
+    pyeong = row["평형"]
+    p_min, p_max = get_area_range(area_group)
+    if area_group != "상관없음" and p_min <= pyeong <= p_max:
+        score += 0.5
+    building_type = str(row.get("건축유형", "")).strip()
+    if condition != "상관없음":
+        if condition == "신축" and (row['준공연도'] >= 2018 or building_type == "신축"):
+            score += 0.5
+        elif condition == building_type:
+            score += 0.5
+    if "상관없음" not in lines:
+        if row['역세권'] == "Y" and any(line in str(row.get("노선", "")) for line in lines):
+            score += 0.5
+    세대수 = row['세대수'] if pd.notna(row['세대수']) else 0
+    if household != "상관없음":
+        if household == "대단지" and 세대수 >= 1000:
+            score += 0.5
+        elif household == "소단지 (300세대 이상)" and 300 <= 세대수 < 1000:
+            score += 0.5
+        elif household == "소단지 (300세대 이하)" and 세대수 < 300:
+            score += 0.5
+    return score
+
+
+# --- 열 단위 조건 마스크 ---
+def _text_column(df, column):
+    """row.get(column, "")을 str()로 변환한 것과 같은 문자열 열"""
+    if column not in df:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[column].astype(str)
+
+
+def area_mask(df, area_group):
+    """평형이 선택한 평형대 범위 안에 있는지"""
+    p_min, p_max = get_area_range(area_group)
+    return df['평형'].between(p_min, p_max).to_numpy()
+
+
+def condition_mask(df, condition):
+    """건물 컨디션 일치 여부 (신축은 2018년 이후 준공 포함)"""
+    building_type = _text_column(df, "건축유형").str.strip()
+    if condition == "신축":
+        return ((df['준공연도'] >= 2018) | (building_type == "신축")).to_numpy()
+    return (building_type == condition).to_numpy()
+
+
+def line_mask(df, lines):
+    """역세권이면서 선호 노선 중 하나라도 노선 문자열에 포함되는지"""
+    routes = _text_column(df, "노선")
+    has_line = np.zeros(len(df), dtype=bool)
+    for line in lines:
+        has_line |= routes.str.contains(line, regex=False, na=False).to_numpy(dtype=bool)
+    return (df['역세권'] == "Y").to_numpy() & has_line
+
+
+def household_mask(df, household):
+    """단지 규모 일치 여부 (세대수 결측은 0세대로 간주)"""
+    세대수 = df['세대수'].fillna(0)
+    if household == "대단지":
+        return (세대수 >= 1000).to_numpy()
+    if household == "소단지 (300세대 이상)":
+        return ((세대수 >= 300) & (세대수 < 1000)).to_numpy()
+    if household == "소단지 (300세대 이하)":
+        return (세대수 < 300).to_numpy()
+    return np.full(len(df), household == "상관없음")
+
+
+# --- 벡터화 점수 ---
+def complex_scores(df, area_group, condition, lines, household):
+    """score_complex와 동일한 점수를 열 단위로 계산"""
+    area_score = np.where(area_mask(df, area_group), 1.5, 1.0 if area_group == "상관없음" else 0.0)
+    if condition == "신축":
+        condition_score = np.where(condition_mask(df, condition), 2.5, 0.0)
+    elif condition == "상관없음":
+        condition_score = np.full(len(df), 1.5)
+    else:
+        condition_score = np.where(condition_mask(df, condition), 1.5, 0.0)
+    if "상관없음" not in lines:
+        line_score = np.where(line_mask(df, lines), 1.5, 0.0)
+    else:
+        line_score = np.full(len(df), 1.0)
+    household_score = np.where(household_mask(df, household), 1.0, 0.0)
+    return pd.Series(area_score + condition_score + line_score + household_score, index=df.index)
+
+
+def correlated_scores(df, area_group, condition, lines, household):
+    """score_correlated_factors와 동일한 점수를 열 단위로 계산"""
+    score = np.zeros(len(df))
+    if area_group != "상관없음":
+        score += np.where(area_mask(df, area_group), 0.5, 0.0)
+    if condition != "상관없음":
+        score += np.where(condition_mask(df, condition), 0.5, 0.0)
+    if "상관없음" not in lines:
+        score += np.where(line_mask(df, lines), 0.5, 0.0)
+    if household != "상관없음":
+        score += np.where(household_mask(df, household), 0.5, 0.0)
+    return pd.Series(score, index=df.index)
+
+
+class ScoreComponents:
+    """조건 항목(평형대, 컨디션, 노선, 단지 규모)별·선택지별 (점수, 상관_점수) 성분
+
+    입력 폼의 모든 선택지는 만들 때 미리 계산하고, 그 밖의 값은 처음 쓰일 때 계산해 둔다.
+    조건이 바뀌면 성분을 더하기만 하므로 complex_scores/correlated_scores와 결과가 같다.
+    """
+
+    def __init__(self, df):
+        self._df = df
+        self._area, self._condition, self._household, self._line = {}, {}, {}, {}
+        self._station = (df['역세권'] == "Y").to_numpy()
+        self._routes = _text_column(df, "노선")
+        for area_group in AREA_GROUPS:
+            self.area(area_group)
+        for condition in CONDITIONS:
+            self.condition(condition)
+        for household in HOUSEHOLDS:
+            self.household(household)
+        for line in LINES:
+            self._line_contains(line)
+
+    def __len__(self):
+        return len(self._df)
+
+    def area(self, area_group):
+        if area_group not in self._area:
+            mask = area_mask(self._df, area_group)
+            self._area[area_group] = (
+                np.where(mask, 1.5, 1.0 if area_group == "상관없음" else 0.0),
+                np.where(mask, 0.5, 0.0) if area_group != "상관없음" else np.zeros(len(mask)),
+            )
+        return self._area[area_group]
+
+    def condition(self, condition):
+        if condition not in self._condition:
+            if condition == "상관없음":
+                score, correlated = np.full(len(self), 1.5), np.zeros(len(self))
+            else:
+                mask = condition_mask(self._df, condition)
+                score = np.where(mask, 2.5 if condition == "신축" else 1.5, 0.0)
+                correlated = np.where(mask, 0.5, 0.0)
+            self._condition[condition] = (score, correlated)
+        return self._condition[condition]
+
+    def household(self, household):
+        if household not in self._household:
+            mask = household_mask(self._df, household)
+            self._household[household] = (
+                np.where(mask, 1.0, 0.0),
+                np.where(mask, 0.5, 0.0) if household != "상관없음" else np.zeros(len(mask)),
+            )
+        return self._household[household]
+
+    def _line_contains(self, line):
+        if line not in self._line:
+            self._line[line] = self._routes.str.contains(line, regex=False, na=False).to_numpy(dtype=bool)
+        return self._line[line]
+
+    def lines(self, lines):
+        if "상관없음" in lines:
+            return np.full(len(self), 1.0), np.zeros(len(self))
+        has_line = np.zeros(len(self), dtype=bool)
+        for line in lines:
+            has_line |= self._line_contains(line)
+        mask = self._station & has_line
+        return np.where(mask, 1.5, 0.0), np.where(mask, 0.5, 0.0)
+
+    def scores(self, area_group, condition, lines, household):
+        """(점수, 상관_점수) 배열"""
+        parts = [self.area(area_group), self.condition(condition), self.lines(lines), self.household(household)]
+        return sum(score for score, _ in parts), sum(correlated for _, correlated in parts)
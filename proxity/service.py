@@ -0,0 +1,273 @@
+"""추천 JSON API 서버 (스레드 풀 기반, 모든 요청이 전처리된 데이터셋 하나를 공유)
+
+    python -m proxity.service --port 8000            # 기본 데이터: data/jw_v0.13_streamlit_ready.csv
+    curl -s localhost:8000/recommend -d '{"cash": 16, "loan": 12, "area_group": "30평대"}'
+
+    GET  /health            데이터 버전, 후보 수, 결과 캐시 적중률
+    POST /recommend         입력 폼과 같은 조건 하나 -> {"version", "results": [...]}
+    POST /recommend/batch   {"requests": [조건, ...]} -> {"version", "results": [[...], ...]}
+    POST /recommend/sweep   조건 + budget_min, budget_max, budget_step -> {"version", "table", "summary"}
+    POST /similar           {"name", "district", "limit", "max_price"} -> {"version", "results": [...]} (가까운 순,
+                            단지명이 여러 법정동에 있으면 district 필수)
+"""
+import argparse
+import json
+import logging
+import math
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from proxity.cache import recommend_cached, result_cache
+from proxity.dataset import DATA_FILE, load_dataset
+from proxity.engine import Profile, budget_points, recommend_batch, similar_complexes, sweep_budgets
+from proxity.prices import TREND_COLUMNS
+from proxity.profiling import configure_timing_log, trace_request
+from proxity.scoring import AREA_GROUPS, CONDITIONS, HOUSEHOLD_LABELS, HOUSEHOLDS, LINES
+
+logger = logging.getLogger(__name__)
+
+# 응답에 싣는 결과 열 (가격 출처, 예산차이, 조건 불일치 여부 포함)
+RESULT_COLUMNS = [
+    "단지명", "평형", "전용면적", "준공연도", "세대수", "건축유형", "노선",
+    "추천가격", "현재호가", "가격출처", "가격출처_실사용", "호가전용면적", "거래일",
+    "점수", "상관_점수", "예산차이", "조건설명", "조건불일치", "추천이유", "예산초과여부",
+    *TREND_COLUMNS, "비슷한단지",
+]
+# 유사 단지 응답 열
+SIMILAR_COLUMNS = ["법정동", "단지명", "거리", "평형", "전용면적", "준공연도", "세대수", "노선", "추천가격", "가격출처_실사용"]
+# 입력 폼의 금액 상한 (현금, 대출)
+MAX_CASH = 100.0
+MAX_LOAN = 30.0
+MAX_BATCH = 1000
+MAX_SIMILAR = 50
+MAX_BODY_BYTES = 1 << 20
+
+
+def _amount(payload, name, upper):
+    value = payload.get(name, 0.0)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= upper:
+        raise ValueError(f"'{name}'은(는) 0 이상 {upper} 이하의 숫자여야 합니다.")
+    return float(value)
+
+
+def _choice(payload, name, options):
+    value = payload.get(name, "상관없음")
+    if value not in options:
+        raise ValueError(f"'{name}' 값이 올바르지 않습니다: {value!r} (가능한 값: {', '.join(options)})")
+    return value
+
+
+def parse_profile(payload):
+    """입력 폼과 같은 JSON 조건을 Profile로 변환 (단지 규모는 폼 라벨과 내부 값 모두 허용)"""
+    if not isinstance(payload, dict):
+        raise ValueError("조건은 JSON 객체여야 합니다.")
+    lines = payload.get("lines", [])
+    if isinstance(lines, str):
+        lines = [lines]
+    if not isinstance(lines, list) or any(line not in LINES + ["상관없음"] for line in lines):
+        raise ValueError(f"'lines'는 {', '.join(LINES)}, 상관없음 중에서 고른 목록이어야 합니다.")
+    household = _choice(payload, "household", list(HOUSEHOLD_LABELS) + HOUSEHOLDS)
+    cash, loan = _amount(payload, "cash", MAX_CASH), _amount(payload, "loan", MAX_LOAN)
+    # 예산 대비 초과 비율을 계산하므로 총예산이 0이면 추천할 수 없음
+    if cash + loan <= 0:
+        raise ValueError("'cash'와 'loan'의 합(총예산)은 0보다 커야 합니다.")
+    return Profile(
+        cash,
+        loan,
+        _choice(payload, "area_group", AREA_GROUPS),
+        _choice(payload, "condition", CONDITIONS),
+        tuple(lines),
+        household,
+    ).normalized()
+
+
+def _json_value(value):
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return value
+
+
+def result_records(result, columns=RESULT_COLUMNS):
+    """추천 결과 프레임 -> JSON 직렬화 가능한 dict 목록"""
+    columns = [column for column in columns if column in result]
+    return [
+        {column: _json_value(value) for column, value in zip(columns, row)}
+        for row in result[columns].itertuples(index=False, name=None)
+    ]
+
+
+class RecommendationService:
+    """데이터 파일 하나를 서비스하는 추천기 (요청마다 파일 변경만 확인하고 전처리 결과는 공유)"""
+
+    def __init__(self, path=DATA_FILE):
+        self.path = path
+        self.dataset = load_dataset(path)
+
+    def refresh(self):
+        # load_dataset은 mtime/크기가 같으면 캐시된 데이터셋을 그대로 돌려줌
+        self.dataset = load_dataset(self.path)
+        return self.dataset
+
+    def recommend(self, payload):
+        dataset = self.refresh()
+        with trace_request("service.recommend"):
+            result = recommend_cached(parse_profile(payload), dataset)
+        return {"version": dataset.version, "results": result_records(result)}
+
+    def recommend_batch(self, payload):
+        requests = payload.get("requests") if isinstance(payload, dict) else None
+        if not isinstance(requests, list) or not requests:
+            raise ValueError("'requests'는 비어 있지 않은 조건 목록이어야 합니다.")
+        if len(requests) > MAX_BATCH:
+            raise ValueError(f"한 번에 최대 {MAX_BATCH}건까지 요청할 수 있습니다.")
+        profiles = [parse_profile(item) for item in requests]
+        dataset = self.refresh()
+        with trace_request("service.recommend_batch"):
+            results = recommend_batch(profiles, dataset)
+        return {"version": dataset.version, "results": [result_records(result) for result in results]}
+
+    def sweep(self, payload):
+        profile = parse_profile(payload)
+        budgets = budget_points(*(_amount(payload, name, MAX_CASH + MAX_LOAN)
+                                  for name in ("budget_min", "budget_max", "budget_step")))
+        dataset = self.refresh()
+        with trace_request("service.sweep"):
+            table, summary = sweep_budgets(profile, budgets, dataset)
+        return {"version": dataset.version, "table": result_records(table, table.columns),
+                "summary": result_records(summary, summary.columns)}
+
+    def similar(self, payload):
+        name = payload.get("name") if isinstance(payload, dict) else None
+        if not isinstance(name, str) or not name:
+            raise ValueError("'name'은 단지명 문자열이어야 합니다.")
+        limit = payload.get("limit", 5)
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= MAX_SIMILAR:
+            raise ValueError(f"'limit'은 1 이상 {MAX_SIMILAR} 이하의 정수여야 합니다.")
+        max_price = _amount(payload, "max_price", MAX_CASH + MAX_LOAN) if "max_price" in payload else None
+        district = payload.get("district")
+        if district is not None and not isinstance(district, str):
+            raise ValueError("'district'는 법정동 문자열이어야 합니다.")
+        dataset = self.refresh()
+        with trace_request("service.similar"):
+            result = similar_complexes(dataset, name, limit, max_price, district)
+        return {"version": dataset.version, "results": result_records(result, SIMILAR_COLUMNS)}
+
+    def health(self):
+        dataset = self.refresh()
+        return {
+            "status": "ok",
+            "version": dataset.version,
+            "listings": len(dataset.listings),
+            "candidates": len(dataset.candidates),
+            "result_cache": result_cache.stats(),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "proxity"
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("요청 본문이 너무 큽니다.")
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON 형식 오류: {e}")
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send(404, {"error": "not found"})
+        self._send(200, self.server.service.health())
+
+    def do_POST(self):
+        routes = {"/recommend": self.server.service.recommend,
+                  "/recommend/batch": self.server.service.recommend_batch,
+                  "/recommend/sweep": self.server.service.sweep,
+                  "/similar": self.server.service.similar}
+        handler = routes.get(self.path)
+        if handler is None:
+            return self._send(404, {"error": "not found"})
+        try:
+            self._send(200, handler(self._read_json()))
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            logger.exception("추천 처리 중 오류")
+            self._send(500, {"error": f"추천 처리 중 오류 발생: {e}"})
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(host="127.0.0.1", port=8000, path=DATA_FILE):
+    """데이터셋을 미리 전처리한 HTTP 서버 (serve_forever는 호출하지 않음)"""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = RecommendationService(path)
+    return server
+
+
+def serve_in_thread(host="127.0.0.1", port=0, path=DATA_FILE):
+    """백그라운드 스레드에서 서버 실행 (로컬 클라이언트 시험용, port=0이면 빈 포트 사용)"""
+    server = make_server(host, port, path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def request_json(url, payload=None, timeout=10):
+    """로컬 클라이언트: payload가 있으면 POST, 없으면 GET 후 (상태 코드, JSON 응답)"""
+    data = None if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--data", default=DATA_FILE, help="매물 CSV 경로 (같은 이름의 .arrow 스냅샷 우선)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    configure_timing_log()
+    server = make_server(args.host, args.port, args.data)
+    print(f"http://{args.host}:{server.server_port} 에서 추천 API 실행 중 ({args.data})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+"""유사 단지 최근접 이웃 색인: 데이터셋을 만들 때 단지별 특성 벡터를 미리 계산
+
+특성은 평단가(로그), 준공연도, 세대수(로그), 역세권 여부, 노선(3/7/9/신분당선),
+평형대 구성 비율이며 표준화한 뒤 유클리드 거리로 비교한다. 조회는 단지 수 x 특성 수
+float32 행렬과의 거리 계산 한 번과 부분 선택이라, 후보 프레임을 다시 훑거나
+모든 단지 쌍의 거리를 미리 만들어 둘 필요가 없다.
+"""
+import numpy as np
+import pandas as pd
+
+from proxity.ranking import cheapest_per_complex
+from proxity.scoring import AREA_GROUPS, get_area_range
+
+# 노선 열('3, 신분당선' 등)에서 찾는 노선 토큰
+ROUTE_TOKENS = ['3', '7', '9', '신분당선']
+
+
+def _route_flags(routes):
+    wrapped = "," + routes.astype(str).str.replace(" ", "", regex=False) + ","
+    return {f"노선_{token}": wrapped.str.contains(f",{token},", regex=False).to_numpy(dtype=float)
+            for token in ROUTE_TOKENS}
+
+
+def complex_features(candidates, complex_codes):
+    """단지 코드 순서의 특성 행렬 (표준화 전, 결측은 열 중앙값으로 채움)"""
+    pyeong = candidates['평형'].to_numpy(dtype=float)
+    price = candidates['추천가격'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_pyeong = np.where(pyeong > 0, price / pyeong, np.nan)
+    rows = pd.DataFrame({
+        '단지': complex_codes,
+        '평단가': np.log(per_pyeong),
+        '준공연도': candidates['준공연도'].to_numpy(dtype=float),
+        '세대수': np.log1p(candidates['세대수'].to_numpy(dtype=float)),
+        '역세권': (candidates['역세권'] == "Y").to_numpy(dtype=float),
+        **_route_flags(candidates['노선']),
+        **{f"평형_{g}": ((pyeong > get_area_range(g)[0]) & (pyeong <= get_area_range(g)[1])).astype(float)
+           for g in AREA_GROUPS if g != "상관없음"},
+    })
+    aggregations = {column: 'mean' for column in rows.columns if column != '단지'}
+    aggregations.update({'평단가': 'median', '준공연도': 'max', '세대수': 'max'})
+    features = rows.groupby('단지', sort=True).agg(aggregations)
+    return features.fillna(features.median()).fillna(0.0)
+
+
+class SimilarityIndex:
+    """단지별 표준화 특성 벡터와 최저가 후보 위치 (위치 = 단지 코드 오름차순, 단지명이 아니라 코드로 구분)"""
+
+    def __init__(self, candidates, complex_codes):
+        features = complex_features(candidates, complex_codes)
+        self.codes = features.index.to_numpy()
+        matrix = features.to_numpy(dtype=np.float64)
+        scale = matrix.std(axis=0)
+        self.matrix = ((matrix - matrix.mean(axis=0)) / np.where(scale > 0, scale, 1.0)).astype(np.float32)
+        self._squared = (self.matrix ** 2).sum(axis=1)
+
+        cheapest = cheapest_per_complex(np.arange(len(candidates)), complex_codes,
+                                        candidates['추천가격'].to_numpy(dtype=float))
+        # 단지 코드 -> 최저가 후보 위치
+        self.cheapest = np.full(len(self.codes), -1, dtype=np.int64)
+        self.cheapest[np.searchsorted(self.codes, complex_codes[cheapest])] = cheapest
+        self.min_price = candidates['추천가격'].to_numpy(dtype=float)[self.cheapest]
+        self.names = candidates['단지명'].astype(object).to_numpy()[self.cheapest]
+        self.districts = candidates['법정동'].astype(object).to_numpy()[self.cheapest]
+        # 단지명 -> 위치 목록 (법정동이 다르면 같은 단지명이 여러 단지)
+        self._by_name = {}
+        for slot, name in enumerate(self.names):
+            self._by_name.setdefault(name, []).append(slot)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def slots(self, complex_codes):
+        """단지 코드 배열의 색인 위치"""
+        return np.searchsorted(self.codes, complex_codes)
+
+    def slot(self, name, district=None):
+        """단지명(과 법정동)의 색인 위치: 없으면 None, 법정동 없이 여러 단지에 해당하면 ValueError"""
+        slots = [slot for slot in self._by_name.get(name, [])
+                 if district is None or self.districts[slot] == district]
+        if len(slots) > 1:
+            districts = ", ".join(str(self.districts[slot]) for slot in slots)
+            raise ValueError(f"'{name}' 단지가 여러 법정동에 있습니다 ({districts}). 법정동을 지정하세요.")
+        return slots[0] if slots else None
+
+    def key(self, slot):
+        """색인 위치의 (법정동, 단지명)"""
+        return (self.districts[slot], self.names[slot])
+
+    def distances(self, slot):
+        """slot 단지와 모든 단지의 유클리드 거리"""
+        squared = self._squared + self._squared[slot] - 2.0 * (self.matrix @ self.matrix[slot])
+        return np.sqrt(np.maximum(squared, 0))
+
+    def similar(self, slot, limit=5, max_price=None, exclude=()):
+        """slot 단지와 가까운 순으로 (위치, 거리) 목록: 최저가가 max_price 이하인 단지만, 자기 자신과 exclude 위치 제외"""
+        if limit <= 0:
+            return []
+        distances = self.distances(slot)
+        allowed = np.ones(len(self), dtype=bool) if max_price is None else self.min_price <= max_price
+        allowed[slot] = False
+        allowed[np.asarray(list(exclude), dtype=np.int64)] = False
+        positions = np.flatnonzero(allowed)
+        if len(positions) > limit:
+            positions = positions[np.argpartition(distances[positions], limit - 1)[:limit]]
+        # 거리가 같으면 단지 코드 순
+        positions = positions[np.lexsort((positions, distances[positions]))]
+        return [(int(position), float(distances[position])) for position in positions]
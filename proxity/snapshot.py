@@ -0,0 +1,113 @@
+"""전처리된 매물 데이터의 열 단위 스냅샷 (Arrow IPC) 빌드 및 로드
+
+python -m proxity.snapshot [CSV ...] 로 data/jw_v0.*_streamlit_ready.csv 옆에
+같은 이름의 .arrow 스냅샷을 만든다. 앱은 스냅샷이 있으면 메모리 매핑으로 읽고,
+없거나 원본 CSV와 내용이 달라졌으면 CSV를 직접 전처리한다. 스냅샷은 compact_listings를
+거친 형태(카테고리형, float32 정수값 열)로 저장된다.
+"""
+import glob
+import logging
+import os
+import sys
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow가 없으면 CSV 경로만 사용
+    pa = None
+
+SNAPSHOT_SCHEMA_VERSION = "1"
+SNAPSHOT_SUFFIX = ".arrow"
+DATA_GLOB = "data/jw_v0.*_streamlit_ready.csv"
+
+logger = logging.getLogger(__name__)
+
+_META_SCHEMA = b"proxity.schema_version"
+_META_SOURCE = b"proxity.source"
+_META_VERSION = b"proxity.source_version"
+
+
+def snapshot_path(csv_path):
+    """CSV에 대응하는 스냅샷 경로"""
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_SUFFIX
+
+
+def write_snapshot(listings, path, source, version):
+    """전처리된 매물 프레임을 스키마/버전 헤더와 함께 비압축 Arrow 파일로 기록
+
+    카테고리형 열은 사전(dictionary) 인코딩으로 저장되어 읽을 때도 카테고리형이 된다.
+    """
+    table = pa.Table.from_pandas(listings, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _META_SCHEMA: SNAPSHOT_SCHEMA_VERSION.encode(),
+        _META_SOURCE: os.path.basename(source).encode(),
+        _META_VERSION: version.encode(),
+    })
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot_header(path):
+    """스냅샷 헤더 (스키마 버전, 원본 파일명, 원본 버전) 반환, 읽을 수 없으면 None"""
+    if pa is None or not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        if metadata.get(_META_SCHEMA) != SNAPSHOT_SCHEMA_VERSION.encode():
+            return None
+        return {
+            "schema_version": SNAPSHOT_SCHEMA_VERSION,
+            "source": metadata[_META_SOURCE].decode(),
+            "version": metadata[_META_VERSION].decode(),
+        }
+    except (OSError, pa.ArrowInvalid, KeyError) as e:
+        # 잘린 파일이나 다른 프로그램이 만든 .arrow는 없는 것으로 보고 CSV를 사용
+        logger.warning("%s: 스냅샷을 읽을 수 없어 무시합니다 (%s: %s)", path, type(e).__name__, e)
+        return None
+
+
+def read_snapshot(path, exclude=()):
+    """메모리 매핑으로 스냅샷을 읽어 매물 프레임 반환 (exclude 열은 읽지 않음)"""
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select([name for name in table.schema.names if name not in exclude]).to_pandas()
+
+
+def read_snapshot_columns(path, columns):
+    """스냅샷에서 지정한 열만 읽기"""
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select([name for name in columns if name in table.schema.names]).to_pandas()
+
+
+def build_snapshot(csv_path):
+    """CSV를 전처리해 스냅샷을 만들고 경로 반환"""
+    from proxity.dataset import compact_listings, file_digest, memory_usage, prepare_listings
+
+    if pa is None:
+        raise RuntimeError("스냅샷을 만들려면 pyarrow가 필요합니다.")
+    path = snapshot_path(csv_path)
+    listings = prepare_listings(pd.read_csv(csv_path))
+    compacted = compact_listings(listings)
+    print(f"{csv_path}: 메모리 {memory_usage(listings) / 1024:.1f}KB -> {memory_usage(compacted) / 1024:.1f}KB")
+    write_snapshot(compacted, path, csv_path, file_digest(csv_path))
+    return path
+
+
+def main(argv=None):
+    csv_paths = (argv if argv is not None else sys.argv[1:]) or sorted(glob.glob(DATA_GLOB))
+    if not csv_paths:
+        print(f"'{DATA_GLOB}'에 해당하는 파일이 없습니다.")
+        return 1
+    for csv_path in csv_paths:
+        print(f"{csv_path} -> {build_snapshot(csv_path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""동일 단지 유사 평형 호가 추정: 행 단위 기준 구현과 fill_asking_prices 정합성 (동률 처리 포함)
+
+    python -m pytest tests/test_pricing.py
+"""
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from proxity.dataset import DATA_FILE, eligible_listings, load_dataset
+from proxity.pricing import estimate_similar_asking_price, fill_asking_prices
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), os.pardir, DATA_FILE)
+
+
+def tie_heavy_listings(rows=2000, seed=0):
+    """동률 처리 점검용 합성 매물: 단지 수가 적고, 내림값이 같은 면적과 양쪽으로 같은 거리의 면적이 많음"""
+    rng = np.random.default_rng(seed)
+    # 84.5/84.9, 59.2/59.9처럼 내림값이 같고, 72는 60과 84에서 같은 거리
+    areas = np.array([59.2, 59.9, 60.4, 72.0, 72.7, 84.5, 84.9, 84.1, 96.3, 108.0])
+    names = np.array(['가', '나', '다', '라', None], dtype=object)
+    prices = np.round(rng.uniform(10, 40, rows), 2)
+    prices[rng.random(rows) < 0.5] = np.nan
+    return pd.DataFrame({
+        '단지명': names[rng.integers(0, len(names), rows)],
+        '전용면적': areas[rng.integers(0, len(areas), rows)],
+        '현재호가': prices,
+    })
+
+
+def check_parity(df):
+    """행 단위 기준 구현(estimate_similar_asking_price)과 fill_asking_prices가 다른 (행 색인, 열) 목록"""
+    with warnings.catch_warnings():
+        # 기준 구현이 필터링된 프레임에 열을 추가하며 내는 SettingWithCopyWarning
+        warnings.simplefilter("ignore")
+        expected = df.apply(lambda row: estimate_similar_asking_price(row, df), axis=1, result_type='expand')
+    expected.columns = ['현재호가', '가격출처', '호가전용면적']
+    actual = fill_asking_prices(df)
+    mismatches = []
+    for column in expected.columns:
+        if column == '가격출처':
+            same = expected[column].to_numpy() == actual[column].to_numpy()
+        else:
+            left, right = expected[column].to_numpy(dtype=float), actual[column].to_numpy(dtype=float)
+            same = (left == right) | (np.isnan(left) & np.isnan(right))
+        mismatches.extend((index, column) for index in df.index[~same])
+    return mismatches
+
+
+def test_parity_on_real_listings():
+    if not os.path.exists(DATA_PATH):
+        pytest.skip(f"{DATA_FILE} 없음")
+    # 전처리된 매물의 현재호가는 추정으로 채우기 전 값, 추정은 추천 대상(실거래가 1억 이상)에만 적용
+    listings = eligible_listings(load_dataset(DATA_PATH).listings)[['단지명', '전용면적', '현재호가']]
+    assert not check_parity(listings)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_parity_on_tie_heavy_listings(seed):
+    assert not check_parity(tie_heavy_listings(seed=seed))
@@ -0,0 +1,54 @@
+"""단지 점수: 행 단위 기준 구현과 벡터화 점수/점수 성분 정합성 (입력 폼의 모든 조건 조합)
+
+    python -m pytest tests/test_scoring.py
+"""
+import itertools
+import os
+
+import numpy as np
+import pytest
+
+from proxity.dataset import DATA_FILE, load_dataset
+from proxity.scoring import (AREA_GROUPS, CONDITIONS, HOUSEHOLDS, LINES, ScoreComponents, complex_scores,
+                             correlated_scores, score_complex, score_correlated_factors)
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), os.pardir, DATA_FILE)
+
+
+def all_profiles(area_groups=AREA_GROUPS):
+    """입력 폼에서 가능한 모든 (평형대, 컨디션, 노선, 단지규모) 조합"""
+    line_sets = [list(c) for r in range(len(LINES) + 1) for c in itertools.combinations(LINES, r)]
+    line_sets.append(["상관없음"])
+    return itertools.product(area_groups, CONDITIONS, line_sets, HOUSEHOLDS)
+
+
+def check_parity(df, profiles=None):
+    """행 단위 기준 구현과 벡터화 점수가 다른 (조건, 열) 목록"""
+    mismatches = []
+    components = ScoreComponents(df)
+    for area_group, condition, lines, household in profiles or all_profiles():
+        expected = df.apply(lambda row: score_complex(row, 0, 0, area_group, condition, lines, household), axis=1)
+        actual = complex_scores(df, area_group, condition, lines, household)
+        if not np.array_equal(expected.to_numpy(dtype=float), actual.to_numpy()):
+            mismatches.append(((area_group, condition, lines, household), "점수"))
+        expected = df.apply(lambda row: score_correlated_factors(row, area_group, condition, lines, household), axis=1)
+        actual = correlated_scores(df, area_group, condition, lines, household)
+        if not np.array_equal(expected.to_numpy(dtype=float), actual.to_numpy()):
+            mismatches.append(((area_group, condition, lines, household), "상관_점수"))
+        score, correlated = components.scores(area_group, condition, lines, household)
+        if not (np.array_equal(score, complex_scores(df, area_group, condition, lines, household).to_numpy())
+                and np.array_equal(correlated, actual.to_numpy())):
+            mismatches.append(((area_group, condition, lines, household), "점수 성분"))
+    return mismatches
+
+
+@pytest.fixture(scope="module")
+def listings():
+    if not os.path.exists(DATA_PATH):
+        pytest.skip(f"{DATA_FILE} 없음")
+    return load_dataset(DATA_PATH).listings
+
+
+@pytest.mark.parametrize("area_group", AREA_GROUPS)
+def test_parity_on_real_listings(listings, area_group):
+    assert not check_parity(listings, all_profiles([area_group]))